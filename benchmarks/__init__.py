@@ -0,0 +1 @@
+# Time Trakk benchmarks: synthetic histories and timed scenarios
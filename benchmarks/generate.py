@@ -0,0 +1,69 @@
+# Seeded generator for realistic multi-year tracking histories
+
+import os  # Operating system functions
+import json  # JSON handling
+import random  # Seeded randomness
+from datetime import date, datetime, timedelta  # Date and time manipulation
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "config.json")
+
+
+def load_apps(count, config_file=CONFIG_FILE):
+    with open(config_file, 'r') as f:
+        apps = list(dict.fromkeys(json.load(f).get("apps_to_track", [])))
+    return apps[:count]
+
+
+def generate_history(rng, apps, years, end_date=None):
+    # One artist's history: a few favourite apps get most of the time, work
+    # days have 4-14 sessions between 08:00 and 20:00, weekends are sparse.
+    end_date = end_date or date.today()
+    start_date = end_date - timedelta(days=int(365 * years))
+    favourites = rng.sample(apps, min(len(apps), 4))
+    weights = [6 if app in favourites else 1 for app in apps]
+    data = {}
+    day = start_date
+    while day <= end_date:
+        weekend = day.weekday() >= 5
+        if rng.random() < (0.15 if weekend else 0.9):
+            clock = datetime.combine(day, datetime.min.time()) + timedelta(hours=rng.uniform(8, 11))
+            day_end = datetime.combine(day, datetime.min.time()) + timedelta(hours=20)
+            sessions = rng.randint(1, 4) if weekend else rng.randint(4, 14)
+            for _ in range(sessions):
+                duration = int(min(rng.expovariate(1 / 1500) + 15, 3 * 3600))
+                end = clock + timedelta(seconds=duration)
+                if end >= day_end:
+                    break
+                app = rng.choices(apps, weights)[0]
+                data.setdefault(day.isoformat(), {}).setdefault(app, []).append({
+                    "start": clock.strftime("%H:%M:%S"),
+                    "end": end.strftime("%H:%M:%S"),
+                    "duration": duration
+                })
+                clock = end + timedelta(seconds=int(rng.expovariate(1 / 900)))
+        day += timedelta(days=1)
+    return data
+
+
+def generate_background_history(rng, apps, years, end_date=None):
+    # Background sessions (renders, simulations) with the CPU seconds they used
+    data = generate_history(rng, apps, years, end_date)
+    for apps_sessions in data.values():
+        for sessions in apps_sessions.values():
+            for session in sessions:
+                session["cpu"] = round(session["duration"] * rng.uniform(0.2, 4.0), 1)
+    return data
+
+
+def generate_share(root, users, apps, years, seed=0, end_date=None):
+    # Writes <root>/<user>/time_data.json for each user; returns the paths
+    rng = random.Random(seed)
+    paths = []
+    for index in range(users):
+        user_dir = os.path.join(root, f"artist{index:03d}")
+        os.makedirs(user_dir, exist_ok=True)
+        path = os.path.join(user_dir, "time_data.json")
+        with open(path, 'w') as f:
+            json.dump(generate_history(rng, apps, years, end_date), f, indent=4)
+        paths.append(path)
+    return paths
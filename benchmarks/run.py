@@ -0,0 +1,229 @@
+# Timed scenarios for storage, summaries and reports on synthetic histories
+#
+#   python -m benchmarks.run --users 4 --apps 20 --years 3 --out bench.json
+#   python -m benchmarks.run --compare bench.json
+
+import os  # Operating system functions
+import sys  # System-specific parameters and functions
+import json  # JSON handling
+import time  # Time-related functions
+import shutil  # Directory copies
+import argparse  # Command line parsing
+import platform  # Interpreter and OS details
+import tempfile  # Scratch workspace
+import random  # Seeded randomness
+import importlib  # Timed core import
+import subprocess  # Git revision lookup and scenario workers
+import tracemalloc  # Peak memory measurement
+from datetime import date  # Calendar dates
+from benchmarks.generate import load_apps, generate_share, generate_background_history  # Synthetic histories
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REGRESSION_THRESHOLD = 1.2
+REGRESSION_MIN_SECONDS = 0.001  # Ignore noise on sub-millisecond timings
+
+
+def timed(func, repeat=1):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def prepare_workspace(workspace, history_file, backend, apps, years, seed):
+    data_dir = os.path.join(workspace, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    shutil.copy(history_file, os.path.join(data_dir, "time_data.json"))
+    with open(os.path.join(data_dir, "background_data.json"), 'w') as f:
+        json.dump(generate_background_history(random.Random(seed), apps, years), f)
+    shutil.copy(os.path.join(REPO_ROOT, "data", "config.json"), os.path.join(data_dir, "config.json"))
+    with open(os.path.join(data_dir, "config.json"), 'r') as f:
+        config = json.load(f)
+    config["storage"] = backend
+    with open(os.path.join(data_dir, "config.json"), 'w') as f:
+        json.dump(config, f)
+    return data_dir
+
+
+def single_user_scenarios(appends):
+    # Runs in a fresh interpreter whose working directory is the workspace:
+    # trakk.core binds its data paths at import, and the timings go through
+    # the same entry points the tracker, CLI and GUI use.
+    seconds, _ = timed(lambda: importlib.import_module("trakk.core"))
+    from trakk import core  # Tracking core, imported above
+    results = {"import_core": {"seconds": seconds}}
+
+    seconds, _ = timed(core.get_storage)
+    results["open_storage"] = {"seconds": seconds}
+    seconds, data = timed(core.load_data, repeat=3)
+    results["full_load"] = {
+        "seconds": seconds,
+        "sessions": sum(len(s) for apps in data.values() for s in apps.values()),
+        "peak_bytes": peak_memory(core.load_data)
+    }
+    # No rollup.json exists yet, so this builds the index from the history
+    seconds, _ = timed(core.get_rollup)
+    results["rollup_build"] = {"seconds": seconds}
+
+    today = max(data) if data else date.today().isoformat()
+    seconds, _ = timed(lambda: core.generate_summary(today), repeat=20)
+    results["today_summary"] = {"seconds": seconds}
+    seconds, _ = timed(lambda: core.load_data(today, today), repeat=5)
+    results["today_load"] = {"seconds": seconds}
+
+    seconds, months = timed(lambda: core.generate_report(force=True))
+    results["report_full"] = {
+        "seconds": seconds,
+        "months": len(months),
+        "peak_bytes": peak_memory(lambda: core.generate_report(force=True))
+    }
+    seconds, _ = timed(core.generate_report, repeat=3)
+    results["report_incremental"] = {"seconds": seconds}
+
+    tracker = core.TimeTracker()
+    latencies = []
+    for i in range(appends):
+        now = tracker.clock()
+        tracker.app_start_time = now - 30 - i
+        started = time.perf_counter()
+        tracker.log_time("Benchmark", now)
+        latencies.append(time.perf_counter() - started)
+    close_seconds, _ = timed(core.close_storage)
+    latencies.sort()
+    results["log_time"] = {
+        "count": appends,
+        "mean_seconds": sum(latencies) / len(latencies) if latencies else 0.0,
+        "p99_seconds": latencies[int(len(latencies) * 0.99)] if latencies else 0.0,
+        "close_seconds": close_seconds
+    }
+    return results
+
+
+def run_worker(workspace, appends):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--worker", "--appends", str(appends)],
+        cwd=workspace, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def team_scenario(share, out_dir):
+    from trakk.team import build_team_report  # Team aggregation
+    cold, _ = timed(lambda: build_team_report(share, out_dir))
+    warm, _ = timed(lambda: build_team_report(share, out_dir))
+    return {"cold_seconds": cold, "warm_seconds": warm}
+
+
+def run(args):
+    apps = load_apps(args.apps)
+    root = tempfile.mkdtemp(prefix="trakk-bench-")
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "users": args.users,
+            "apps": len(apps),
+            "years": args.years,
+            "seed": args.seed
+        },
+        "scenarios": {}
+    }
+    sys.path.insert(0, REPO_ROOT)
+    try:
+        share = os.path.join(root, "share")
+        seconds, paths = timed(lambda: generate_share(share, args.users, apps, args.years, args.seed))
+        results["meta"]["generate_seconds"] = seconds
+        results["meta"]["history_bytes"] = os.path.getsize(paths[0])
+        for backend in args.backends:
+            workspace = os.path.join(root, f"workspace-{backend}")
+            prepare_workspace(workspace, paths[0], backend, apps, args.years, args.seed)
+            for name, result in run_worker(workspace, args.appends).items():
+                results["scenarios"][f"{backend}.{name}"] = result
+        if args.users > 1:
+            results["scenarios"]["team_report"] = team_scenario(share, os.path.join(root, "team"))
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def timing_keys(scenario):
+    return [key for key in scenario if key.endswith("seconds")]
+
+
+def compare(current, baseline):
+    # Returns (scenario, metric, baseline, current) rows slower than the threshold
+    regressions = []
+    for name, scenario in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for key in timing_keys(scenario):
+            before, after = previous.get(key), scenario[key]
+            if before and after > before * REGRESSION_THRESHOLD and after - before > REGRESSION_MIN_SECONDS:
+                regressions.append((name, key, before, after))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Time Trakk benchmarks")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--apps", type=int, default=20)
+    parser.add_argument("--years", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--appends", type=int, default=500)
+    parser.add_argument("--backends", nargs="+", default=["json", "sqlite"], choices=["json", "sqlite"])
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag scenarios >20%% slower than a previous run")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch workspace")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(single_user_scenarios(args.appends)))
+        return 0
+
+    results = run(args)
+    for name, scenario in results["scenarios"].items():
+        timings = ", ".join(f"{key}={scenario[key] * 1000:.2f}ms" for key in timing_keys(scenario))
+        print(f"{name:<28} {timings}")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=4)
+        print(f"Results written to {args.out}")
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            regressions = compare(results, json.load(f))
+        for name, key, before, after in regressions:
+            print(f"REGRESSION {name}.{key}: {before * 1000:.2f}ms -> {after * 1000:.2f}ms")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+# Shared fixtures: a throwaway config so tests never read or write data/
+
+import json  # JSON handling
+import pytest  # Test framework
+from trakk import core  # Tracking core
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({"apps_to_track": ["Maya", "Blender"]}))
+    monkeypatch.setattr(core, "CONFIG_FILE", str(config_file))
+    monkeypatch.setattr(core, "METRICS_FILE", str(tmp_path / "metrics.json"))
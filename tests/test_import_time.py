@@ -0,0 +1,34 @@
+# Import-time budget for the headless CLI
+
+import os  # Operating system functions
+import sys  # System-specific parameters and functions
+import subprocess  # Fresh interpreters
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_MS = 250
+GUI_MODULES = ("PyQt6", "pyqttoast", "tkinter", "PIL", "infi", "numpy")
+
+
+def run_python(args, cwd):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    return subprocess.run([sys.executable] + args, cwd=cwd, env=env, capture_output=True, text=True, check=True)
+
+
+def test_cli_import_within_budget(tmp_path):
+    best = None
+    for _ in range(3):
+        stderr = run_python(["-X", "importtime", "-c", "import trakk.cli"], tmp_path).stderr
+        for line in stderr.splitlines():
+            fields = [field.strip() for field in line.split("|")]
+            if len(fields) == 3 and fields[2] == "trakk.cli":
+                cumulative_ms = int(fields[1]) / 1000
+                best = cumulative_ms if best is None else min(best, cumulative_ms)
+    assert best is not None
+    assert best < IMPORT_BUDGET_MS, f"import trakk.cli took {best:.1f} ms"
+
+
+def test_cli_import_loads_no_gui_and_touches_no_data(tmp_path):
+    code = f"import sys, trakk.cli; print(','.join(m for m in {GUI_MODULES!r} if m in sys.modules))"
+    assert run_python(["-c", code], tmp_path).stdout.strip() == ""
+    # Storage and the rollup index open lazily, not at import
+    assert not os.path.exists(os.path.join(tmp_path, "data"))
@@ -0,0 +1,43 @@
+# Recorded traces replay to the same sessions as the live run
+
+from datetime import datetime  # Date and time manipulation
+from trakk import core  # Tracking core
+from trakk.scheduler import PollScheduler  # Idle-crossing wake-up
+from trakk.trace import TraceRecorder, MemoryStorage, NullRollup, VirtualClock, replay  # Trace tooling
+
+MONO_START = 1000.0
+WALL_START = datetime(2024, 3, 5, 12, 0, 0).timestamp()
+
+
+def record_live(path, samples):
+    # Mirrors run_loop: record each sample, then feed it to the tracker
+    sink = MemoryStorage()
+    tracker = core.TimeTracker(sink, NullRollup())
+    clock = VirtualClock(MONO_START)
+    tracker.clock = clock
+    tracker.wall_clock = lambda: WALL_START + (clock.now - MONO_START)
+    recorder = TraceRecorder(path, wall_clock=tracker.wall_clock, clock=clock)
+    for offset, name, idle in samples:
+        clock.now = MONO_START + offset
+        recorder.record(clock.now, name, idle)
+        tracker.process_sample(name, idle, clock.now)
+    recorder.close()
+    if tracker.last_app and tracker.app_start_time is not None:
+        tracker.log_time(tracker.last_app, clock.now)
+    return [{"date": date_str, "app": app_name, **session} for date_str, app_name, session in sink.sessions]
+
+
+def test_replay_matches_live_run_at_idle_crossing(config, tmp_path):
+    # The scheduler wakes just past the idle threshold; that tick must stay idle on replay
+    crossing = PollScheduler(core.IDLE_THRESHOLD).next_delay(True, True, 0.0)
+    samples = [
+        (0.0, "maya.exe", 0.0),
+        (crossing, "maya.exe", crossing),
+        (crossing + 1, "maya.exe", 0.5),
+        (200.0, "maya.exe", 0.0),
+        (246.0, "explorer.exe", 0.0),
+    ]
+    path = str(tmp_path / "live.trace")
+    live = record_live(path, samples)
+    assert [session["duration"] for session in live] == [45, 200]
+    assert replay(lambda storage, rollup: core.TimeTracker(storage, rollup), path)["sessions"] == live
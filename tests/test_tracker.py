@@ -0,0 +1,103 @@
+# Tracker state machine driven headless through process_sample and FakeBackend
+
+import time  # Time-related functions
+import threading  # Threading support
+from datetime import datetime  # Date and time manipulation
+import pytest  # Test framework
+from trakk import core  # Tracking core
+from trakk.foreground import FakeBackend  # Scripted foreground changes
+from trakk.trace import MemoryStorage, NullRollup, VirtualClock  # In-memory sinks and clock
+
+MONO_START = 1000.0
+WALL_START = datetime(2024, 3, 5, 12, 0, 0).timestamp()
+
+
+@pytest.fixture
+def tracked(config):
+    sink = MemoryStorage()
+    tracker = core.TimeTracker(sink, NullRollup())
+    clock = VirtualClock(MONO_START)
+    tracker.clock = clock
+    tracker.wall_clock = lambda: WALL_START + (clock.now - MONO_START)
+
+    def sample(offset, name, idle=0.0):
+        clock.now = MONO_START + offset
+        tracker.process_sample(name, idle, clock.now)
+
+    return tracker, sink, sample
+
+
+def logged(sink):
+    return [(app_name, session["start"], session["end"], session["duration"])
+            for _, app_name, session in sink.sessions]
+
+
+def test_switching_apps_logs_each_session(tracked):
+    tracker, sink, sample = tracked
+    sample(0, "maya.exe")
+    sample(100, "blender.exe")
+    sample(160, "explorer.exe")
+    assert logged(sink) == [
+        ("Maya", "12:00:00", "12:01:40", 100),
+        ("Blender", "12:01:40", "12:02:40", 60),
+    ]
+    assert tracker.last_app is None
+
+
+def test_sessions_shorter_than_minimum_are_dropped(tracked):
+    tracker, sink, sample = tracked
+    sample(0, "maya.exe")
+    sample(core.MINIMUM_ACTIVITY_DURATION - 1, "explorer.exe")
+    assert logged(sink) == []
+
+
+def test_idle_session_ends_when_threshold_passed(tracked):
+    tracker, sink, sample = tracked
+    sample(0, "maya.exe")
+    # Idle noticed late: the session still ends IDLE_THRESHOLD after the last input
+    sample(100, "maya.exe", idle=core.IDLE_THRESHOLD + 25)
+    assert logged(sink) == [("Maya", "12:00:00", "12:01:15", 75)]
+
+
+def test_start_is_backdated_to_first_input(tracked):
+    tracker, sink, sample = tracked
+    sample(0, "explorer.exe")
+    sample(30, "maya.exe", idle=12)
+    sample(100, "explorer.exe")
+    assert logged(sink) == [("Maya", "12:00:18", "12:01:40", 82)]
+
+
+def test_backdated_start_never_precedes_previous_sample(tracked):
+    tracker, sink, sample = tracked
+    sample(0, "explorer.exe")
+    sample(5, "maya.exe", idle=20)
+    sample(100, "explorer.exe")
+    assert logged(sink) == [("Maya", "12:00:00", "12:01:40", 100)]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "tracker did not react"
+        time.sleep(0.01)
+
+
+def test_start_tracking_follows_fake_backend(config):
+    sink = MemoryStorage()
+    tracker = core.TimeTracker(sink, NullRollup())
+    backend = FakeBackend("explorer.exe")
+    thread = threading.Thread(target=tracker.start_tracking, args=(backend,), daemon=True)
+    thread.start()
+    wait_for(lambda: backend.waits)
+
+    backend.push("maya.exe")
+    wait_for(lambda: tracker.last_app == "Maya")
+    backend.push("blender.exe")
+    wait_for(lambda: tracker.last_app == "Blender")
+    tracker.stop_tracking()
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert [app_name for _, app_name, _ in sink.sessions] == ["Maya", "Blender"]
+    # Nothing tracked in front: the loop still wakes to check the config
+    assert backend.waits[0] == core.CONFIG_RELOAD_INTERVAL
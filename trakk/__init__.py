@@ -0,0 +1 @@
+# Time Trakk support modules: storage, tracking backends and reporting helpers
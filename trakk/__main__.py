@@ -0,0 +1,4 @@
+import sys  # System-specific parameters and functions
+from trakk.cli import main  # Headless command line
+
+sys.exit(main())
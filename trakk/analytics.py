@@ -0,0 +1,160 @@
+# Batch analytics over session history using NumPy
+
+import json  # JSON handling
+from datetime import datetime, date  # Date and time manipulation
+from html import escape  # HTML escaping
+import numpy as np  # Vectorised arrays
+
+STREAK_GAP = 300
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+EPOCH_WEEKDAY = 3  # 1970-01-01 was a Thursday
+
+
+def local_offsets(epochs):
+    # UTC offsets looked up once per distinct hour, then broadcast back
+    hours, inverse = np.unique(epochs // 3600, return_inverse=True)
+    offsets = np.array([
+        datetime.fromtimestamp(int(hour) * 3600).astimezone().utcoffset().total_seconds()
+        for hour in hours
+    ], dtype=np.int64)
+    return offsets[inverse] if len(offsets) else np.zeros(0, dtype=np.int64)
+
+
+class SessionArrays:
+    """Session columns as NumPy arrays in local time, sorted by start."""
+
+    def __init__(self, starts, durations, app_ids, apps):
+        order = np.argsort(starts, kind='stable')
+        self.starts = starts[order]
+        self.durations = durations[order]
+        self.app_ids = app_ids[order]
+        self.apps = list(apps)
+        self.local_starts = self.starts + local_offsets(self.starts)
+
+    @classmethod
+    def from_store(cls, store):
+        return cls(
+            np.asarray(store.starts, dtype=np.int64),
+            np.asarray(store.durations, dtype=np.int64),
+            np.asarray(store.app_ids, dtype=np.int64),
+            store.apps
+        )
+
+    def __len__(self):
+        return len(self.starts)
+
+    def days(self):
+        return self.local_starts // 86400
+
+
+def hour_buckets(arrays):
+    # Expands every session into the local clock hours it covers and returns
+    # (absolute hour index, seconds in that hour, app id) per piece.
+    start = arrays.local_starts
+    end = start + arrays.durations
+    first = start // 3600
+    last = np.maximum(end - 1, start) // 3600
+    counts = (last - first + 1).astype(np.int64)
+    owner = np.repeat(np.arange(len(start)), counts)
+    offset_in_session = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    hours = first[owner] + offset_in_session
+    seconds = np.minimum(end[owner], (hours + 1) * 3600) - np.maximum(start[owner], hours * 3600)
+    return hours, np.maximum(seconds, 0), arrays.app_ids[owner]
+
+
+def heatmap(arrays):
+    hours, seconds, _ = hour_buckets(arrays)
+    weekday = (hours // 24 + EPOCH_WEEKDAY) % 7
+    cells = np.bincount(weekday * 24 + hours % 24, weights=seconds, minlength=7 * 24)
+    return cells.reshape(7, 24).astype(np.int64)
+
+
+def weekly_totals(arrays):
+    days = arrays.days()
+    week_starts = days - (days + EPOCH_WEEKDAY) % 7
+    weeks, inverse = np.unique(week_starts, return_inverse=True)
+    totals = np.bincount(inverse, weights=arrays.durations, minlength=len(weeks))
+    result = {}
+    for week_start, total in zip(weeks, totals):
+        year, week, _ = date.fromordinal(date(1970, 1, 1).toordinal() + int(week_start)).isocalendar()
+        result[f"{year}-W{week:02d}"] = int(total)
+    return result
+
+
+def app_share(arrays):
+    months = arrays.days().astype('datetime64[D]').astype('datetime64[M]')
+    periods, period_idx = np.unique(months, return_inverse=True)
+    matrix = np.zeros((len(periods), len(arrays.apps)), dtype=np.int64)
+    np.add.at(matrix, (period_idx, arrays.app_ids), arrays.durations)
+    totals = matrix.sum(axis=1, keepdims=True)
+    shares = np.divide(matrix, totals, out=np.zeros(matrix.shape), where=totals > 0)
+    return {
+        "periods": [str(period) for period in periods],
+        "apps": {
+            app: [round(float(share), 4) for share in shares[:, app_id]]
+            for app_id, app in enumerate(arrays.apps)
+            if matrix[:, app_id].any()
+        }
+    }
+
+
+def focus_streaks(arrays, gap=STREAK_GAP):
+    if not len(arrays):
+        return {"gap_seconds": gap, "count": 0, "longest": 0, "mean": 0, "median": 0, "p90": 0}
+    ends = arrays.starts + arrays.durations
+    breaks = np.concatenate(([True], arrays.starts[1:] - np.maximum.accumulate(ends)[:-1] > gap))
+    streak_ids = np.cumsum(breaks) - 1
+    lengths = np.bincount(streak_ids, weights=arrays.durations)
+    return {
+        "gap_seconds": gap,
+        "count": int(len(lengths)),
+        "longest": int(lengths.max()),
+        "mean": int(lengths.mean()),
+        "median": int(np.median(lengths)),
+        "p90": int(np.percentile(lengths, 90))
+    }
+
+
+def analyze(store, gap=STREAK_GAP):
+    arrays = SessionArrays.from_store(store)
+    return {
+        "sessions": len(arrays),
+        "total_seconds": int(arrays.durations.sum()),
+        "heatmap": {"weekdays": WEEKDAYS, "seconds": heatmap(arrays).tolist()},
+        "weekly": weekly_totals(arrays),
+        "app_share": app_share(arrays),
+        "streaks": focus_streaks(arrays, gap)
+    }
+
+
+def write_json(result, path):
+    with open(path, 'w') as f:
+        json.dump(result, f, indent=4)
+
+
+def html_sections(result):
+    cells = result["heatmap"]["seconds"]
+    peak = max((max(row) for row in cells), default=0) or 1
+    parts = ["<h2>When you work</h2><table><tr><th></th>"]
+    parts.append("".join(f"<th>{hour:02d}</th>" for hour in range(24)) + "</tr>")
+    for name, row in zip(result["heatmap"]["weekdays"], cells):
+        parts.append(f"<tr><th>{name}</th>")
+        for seconds in row:
+            alpha = round(seconds / peak, 2)
+            parts.append(f"<td title=\"{seconds // 60}m\" style=\"background:rgba(58,117,196,{alpha})\">&nbsp;</td>")
+        parts.append("</tr>")
+    parts.append("</table><h2>Weekly totals</h2><ul>")
+    for week, total in sorted(result["weekly"].items(), reverse=True):
+        parts.append(f"<li>{week}: {total // 3600}h {total % 3600 // 60}m</li>")
+    share = result["app_share"]
+    parts.append("</ul><h2>App share per month</h2><table><tr><th>App</th>")
+    parts.append("".join(f"<th>{period}</th>" for period in share["periods"]) + "</tr>")
+    for app, values in share["apps"].items():
+        parts.append(f"<tr><td>{escape(app)}</td>" + "".join(f"<td>{value:.0%}</td>" for value in values) + "</tr>")
+    streaks = result["streaks"]
+    parts.append(
+        f"</table><h2>Focus streaks</h2><p>{streaks['count']} streaks (gaps up to {streaks['gap_seconds'] // 60} min), "
+        f"longest {streaks['longest'] // 60} min, median {streaks['median'] // 60} min, "
+        f"90th percentile {streaks['p90'] // 60} min</p>"
+    )
+    return "".join(parts)
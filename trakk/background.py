@@ -0,0 +1,144 @@
+# Background-process tracking from low-frequency process-table scans
+
+import time  # Time-related functions
+import psutil  # System and process utilities
+from trakk.sessions import split_at_midnight, session_entry  # Day splitting and JSON layout
+from trakk.metrics import metrics  # Hot-path instrumentation
+
+SCAN_INTERVAL = 30
+CPU_THRESHOLD = 0.05  # Fraction of one core that counts as busy
+MINIMUM_DURATION = 60
+
+
+class BackgroundTracker:
+    """Records when tracked apps are busy, whether or not they are in front.
+
+    Every scan lists the process table with ``psutil.process_iter`` fetching
+    only the name (psutil reuses its Process objects and reads the attributes
+    inside ``oneshot()``). A process is matched once, and again only if its
+    name or the tracker's matcher changes; CPU time is read only for processes
+    of tracked apps. An app is busy for a scan interval when its processes
+    used at least ``cpu_threshold`` of one core; consecutive busy intervals
+    form a background session carrying the CPU seconds spent.
+
+    ``matcher_source`` returns the tracker's current AppMatcher. The scanner
+    matches with its own copy, so it never touches the tracker's cache.
+    """
+
+    def __init__(self, matcher_source, storage, rollup, interval=SCAN_INTERVAL, cpu_threshold=CPU_THRESHOLD,
+                 min_duration=MINIMUM_DURATION, clock=time.monotonic, wall_clock=time.time):
+        self.matcher_source = matcher_source
+        self.source = None
+        self.matcher = None
+        self.storage = storage
+        self.rollup = rollup
+        self.interval = interval
+        self.cpu_threshold = cpu_threshold
+        self.min_duration = min_duration
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.processes = {}  # pid -> (Process, name, app or None)
+        self.cpu = {}  # pid -> cpu seconds at the previous scan
+        self.sessions = {}  # app -> [start, last busy, cpu seconds], monotonic
+        self.last_scan = None
+
+    @classmethod
+    def from_config(cls, config, matcher_source, storage, rollup, clock=time.monotonic, wall_clock=time.time):
+        options = config.get("background", {})
+        return cls(
+            matcher_source,
+            storage,
+            rollup,
+            options.get("interval", SCAN_INTERVAL),
+            options.get("cpu_threshold", CPU_THRESHOLD),
+            options.get("min_duration", MINIMUM_DURATION),
+            clock,
+            wall_clock
+        )
+
+    def current_matcher(self):
+        source = self.matcher_source()
+        if source is not self.source:
+            # Config reloaded: match every process again with the new rules
+            self.source = source
+            self.matcher = source.copy()
+            self.processes = {}
+        return self.matcher
+
+    def scan(self, now=None):
+        now = self.clock() if now is None else now
+        matcher = self.current_matcher()
+        seen = set()
+        app_cpu = {}
+        with metrics.timed("background_scan"):
+            for process in psutil.process_iter(attrs=["name"]):
+                pid = process.pid
+                seen.add(pid)
+                name = process.info["name"]
+                entry = self.processes.get(pid)
+                if entry is None or entry[0] is not process or entry[1] != name:
+                    if entry is not None and entry[0] is not process:
+                        # A reused pid (psutil hands out a new object)
+                        self.cpu.pop(pid, None)
+                    entry = self.processes[pid] = (process, name, matcher.match(name) if name else None)
+                app = entry[2]
+                if app is None:
+                    continue
+                try:
+                    times = process.cpu_times()
+                except psutil.Error:
+                    continue
+                cpu = times.user + times.system
+                previous = self.cpu.get(pid)
+                self.cpu[pid] = cpu
+                app_cpu.setdefault(app, 0.0)
+                if previous is not None:
+                    app_cpu[app] += max(cpu - previous, 0.0)
+            for pid in set(self.processes) - seen:
+                del self.processes[pid]
+            for pid in set(self.cpu) - seen:
+                del self.cpu[pid]
+
+        previous_scan, self.last_scan = self.last_scan, now
+        if previous_scan is None:
+            return
+        elapsed = now - previous_scan
+        for app in set(app_cpu) | set(self.sessions):
+            used = app_cpu.get(app, 0.0)
+            if used >= self.cpu_threshold * elapsed:
+                session = self.sessions.get(app)
+                if session is None:
+                    self.sessions[app] = [previous_scan, now, used]
+                else:
+                    session[1] = now
+                    session[2] += used
+            elif app in self.sessions:
+                self.close(app)
+
+    def close(self, app):
+        start, end, cpu = self.sessions.pop(app)
+        duration = int(end - start)
+        if duration < self.min_duration:
+            return
+        wall_start = int(self.wall_clock() - (self.clock() - start))
+        for piece_start, piece_duration in split_at_midnight(wall_start, duration):
+            date_str, session = session_entry(piece_start, piece_duration)
+            session["cpu"] = round(cpu * piece_duration / duration, 1)
+            self.storage.append(date_str, app, session)
+            self.rollup.add(date_str, app, piece_duration, session["cpu"])
+
+    def flush(self):
+        for app in list(self.sessions):
+            self.close(app)
+
+    def run(self, stopped):
+        # The first scan only sets the CPU baselines; it runs without waiting
+        delay = 0
+        while not stopped.wait(delay):
+            try:
+                self.scan()
+            except Exception as e:
+                print(f"Background Scan Error: {e}")
+                metrics.count("errors")
+            delay = self.interval
+        self.flush()
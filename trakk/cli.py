@@ -0,0 +1,221 @@
+# Headless command line: python -m trakk start|stop|status|summary|report|analytics|team-report|replay|gui
+
+import os  # Operating system functions
+import sys  # System-specific parameters and functions
+import time  # Time-related functions
+import json  # JSON handling
+import signal  # Termination signals
+import argparse  # Command line parsing
+import threading  # Threading support
+from datetime import datetime  # Date and time manipulation
+import psutil  # System and process utilities
+from trakk import core  # Tracking core, no GUI imports
+from trakk.journal import read_json  # JSON file helpers
+from trakk.metrics import format_metrics  # Metrics formatting
+
+PID_FILE = core.resource_path(os.path.join("data", "trakk.pid"))
+STOP_FILE = core.resource_path(os.path.join("data", "trakk.stop"))
+STOP_POLL_INTERVAL = 5
+STOP_TIMEOUT = 30
+
+
+def read_pid():
+    try:
+        with open(PID_FILE, 'r') as f:
+            return int(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def running_pid():
+    pid = read_pid()
+    if pid and pid != os.getpid() and psutil.pid_exists(pid):
+        return pid
+    return None
+
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def cmd_start(args):
+    pid = running_pid()
+    if pid:
+        print(f"Time Trakk is already running (pid {pid})")
+        return 1
+    remove_file(STOP_FILE)
+    os.makedirs(core.DATA_DIR, exist_ok=True)
+    with open(PID_FILE, 'w') as f:
+        f.write(str(os.getpid()))
+
+    stop_requested = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop_requested.set())
+
+    tracker = core.TimeTracker()
+    if args.record:
+        from trakk.trace import TraceRecorder  # Only needed when recording
+        tracker.recorder = TraceRecorder(args.record)
+    thread = threading.Thread(target=tracker.start_tracking, daemon=True)
+    thread.start()
+    print(f"Time Trakk tracking (pid {os.getpid()})")
+    try:
+        # `stop` drops a stop file, which also works where signals cannot be
+        # delivered to another console process (Windows).
+        while not stop_requested.wait(STOP_POLL_INTERVAL):
+            if os.path.exists(STOP_FILE):
+                break
+    finally:
+        tracker.stop_tracking()
+        thread.join(STOP_POLL_INTERVAL)
+        core.close_storage()
+        if tracker.recorder:
+            tracker.recorder.close()
+        remove_file(PID_FILE)
+        remove_file(STOP_FILE)
+    if tracker.scheduler:
+        stats = tracker.scheduler.stats()
+        print(f"Time Trakk stopped after {stats['ticks']} ticks ({stats['tick_rate']}/s, "
+              f"mean lateness {stats['mean_lateness'] * 1000:.1f} ms)")
+    else:
+        print("Time Trakk stopped")
+    return 0
+
+
+def cmd_stop(args):
+    pid = running_pid()
+    if not pid:
+        print("Time Trakk is not running")
+        remove_file(PID_FILE)
+        return 1
+    with open(STOP_FILE, 'w') as f:
+        f.write(str(pid))
+    deadline = time.monotonic() + STOP_TIMEOUT
+    while time.monotonic() < deadline:
+        if not psutil.pid_exists(pid) or read_pid() != pid:
+            print("Time Trakk stopped")
+            return 0
+        time.sleep(0.5)
+    print(f"Time Trakk (pid {pid}) did not stop within {STOP_TIMEOUT}s")
+    return 1
+
+
+def cmd_status(args):
+    pid = running_pid()
+    print(f"Time Trakk is running (pid {pid})" if pid else "Time Trakk is not running")
+    total = core.get_rollup().day_total(datetime.now().strftime("%Y-%m-%d"))
+    print(f"Tracked today: {core.format_duration(total) or 'nothing yet'}")
+    if args.metrics:
+        snapshot = read_json(core.METRICS_FILE, None)
+        if snapshot is None:
+            print("No metrics written yet")
+        else:
+            if not pid:
+                print("Last metrics written by a stopped tracker:")
+            print(format_metrics(snapshot))
+    return 0
+
+
+def cmd_summary(args):
+    print(core.generate_summary(args.date) or "No tracked activity found for today.")
+    return 0
+
+
+def cmd_report(args):
+    regenerated = core.generate_report(args.force, args.analytics)
+    if regenerated is None:
+        return 1
+    print(f"Report written to {os.path.abspath(core.HTML_REPORT_FILE)}")
+    if regenerated:
+        print(f"Regenerated: {', '.join(regenerated)}")
+    return 0
+
+
+def cmd_analytics(args):
+    from trakk.analytics import write_json  # NumPy is only needed for analytics
+    result = core.generate_analytics(args.days)
+    if args.json:
+        write_json(result, args.json)
+        print(f"Analytics written to {os.path.abspath(args.json)}")
+    else:
+        print(json.dumps(result, indent=4))
+    return 0
+
+
+def cmd_team_report(args):
+    from trakk.team import build_team_report  # NumPy is only needed for team reports
+    out_dir = args.out or os.path.join(args.share, "team")
+    os.makedirs(out_dir, exist_ok=True)
+    result, parsed = build_team_report(args.share, out_dir, args.workers)
+    print(f"Merged {len(result['users'])} people, {len(parsed)} files re-parsed")
+    print(f"Team report written to {os.path.abspath(os.path.join(out_dir, 'team_report.html'))}")
+    return 0
+
+
+def cmd_replay(args):
+    from trakk.trace import replay, synthesize, session_totals  # Trace tooling
+    if args.synthesize:
+        synthesize(args.trace, args.synthesize, core.load_config().get("apps_to_track", []) + ["explorer.exe"])
+    result = replay(core.TimeTracker, args.trace)
+    if args.json:
+        print(json.dumps(result, indent=4))
+        return 0
+    print(f"Replayed {result['samples']} samples covering {result['trace_seconds']:.0f}s "
+          f"in {result['replay_seconds'] * 1000:.1f} ms "
+          f"({result['samples_per_second']} samples/s, {result['speedup']}x real time)")
+    print(f"{len(result['sessions'])} sessions")
+    for app, total in sorted(session_totals(result).items()):
+        print(f"{app}: {core.format_duration(total)}")
+    return 0
+
+
+def cmd_gui(args):
+    from TimeTrakk import TimeTrackerGUI  # GUI toolkits load only in this mode
+    return TimeTrackerGUI().run()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m trakk", description="Time Trakk headless tracker")
+    commands = parser.add_subparsers(dest="command", required=True)
+    start = commands.add_parser("start", help="track in the foreground until stopped")
+    start.add_argument("--record", metavar="TRACE", help="record foreground/idle samples to a trace file (.gz to compress)")
+    start.set_defaults(func=cmd_start)
+    commands.add_parser("stop", help="stop a running tracker").set_defaults(func=cmd_stop)
+    status = commands.add_parser("status", help="show whether the tracker is running")
+    status.add_argument("--metrics", action="store_true", help="show loop latency, error and resource metrics")
+    status.set_defaults(func=cmd_status)
+    summary = commands.add_parser("summary", help="print per-app totals for a day")
+    summary.add_argument("--date", help="YYYY-MM-DD, defaults to today")
+    summary.set_defaults(func=cmd_summary)
+    report = commands.add_parser("report", help="update the HTML activity report")
+    report.add_argument("--force", action="store_true", help="rebuild every month page")
+    report.add_argument("--analytics", action="store_true", help="also rebuild the analytics page")
+    report.set_defaults(func=cmd_report)
+    analytics = commands.add_parser("analytics", help="heatmap, weekly trends, app share and focus streaks")
+    analytics.add_argument("--json", metavar="PATH", help="write the results to a JSON file")
+    analytics.add_argument("--days", type=int, help="only sessions started in the last N days")
+    analytics.set_defaults(func=cmd_analytics)
+    team = commands.add_parser("team-report", aliases=["merge"], help="merge per-machine data files from a share")
+    team.add_argument("share", help="directory holding <user>/.../time_data.json or <user>.json files")
+    team.add_argument("--out", help="output directory, defaults to <share>/team")
+    team.add_argument("--workers", type=int, help="ingestion processes, defaults to the CPU count")
+    team.set_defaults(func=cmd_team_report)
+    replay_parser = commands.add_parser("replay", help="replay a recorded trace through the tracker")
+    replay_parser.add_argument("trace", help="trace file written by start --record")
+    replay_parser.add_argument("--synthesize", type=int, metavar="SAMPLES", help="first write a synthetic trace with this many samples")
+    replay_parser.add_argument("--json", action="store_true", help="print sessions and timings as JSON")
+    replay_parser.set_defaults(func=cmd_replay)
+    commands.add_parser("gui", help="open the desktop app").set_defaults(func=cmd_gui)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
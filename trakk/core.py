@@ -0,0 +1,376 @@
+# Tracking core: configuration, storage and the TimeTracker state machine.
+# Imports nothing GUI-related so it can run headless.
+
+import os  # Operating system functions
+import time  # Time-related functions
+import json  # JSON handling
+import sys  # System-specific parameters and functions
+import ctypes  # C types for interacting with DLLs
+import threading  # Threading support
+from datetime import datetime  # Date and time manipulation
+from trakk.storage import open_storage, JournalStorage  # Pluggable session storage
+from trakk.foreground import create_backend, process_name_for_window  # Foreground change detection
+from trakk.matcher import AppMatcher  # Compiled tracked-app matching
+from trakk.rollup import RollupIndex  # Precomputed duration totals
+from trakk.report import ReportBuilder  # Partitioned HTML report
+from trakk.sessions import SessionStore, split_at_midnight, session_entry  # Day splitting and session layout
+from trakk.scheduler import PollScheduler  # Monotonic wake-up scheduling
+from trakk.metrics import metrics, MetricsWriter, DROPPED_TICK_LATENESS  # Hot-path instrumentation
+from trakk.background import BackgroundTracker  # Background-process sessions
+
+if sys.platform == "win32":
+    import win32api
+    import win32gui
+
+def resource_path(relative_path):
+    base_path = getattr(sys, '_MEIPASS', os.path.abspath("."))
+    return os.path.join(base_path, relative_path)
+
+DATA_DIR = resource_path("data")
+CONFIG_FILE = resource_path(os.path.join("data", "config.json"))
+DATA_FILE = resource_path(os.path.join("data", "time_data.json"))
+HTML_REPORT_FILE = resource_path(os.path.join("data", "activity_report.html"))
+ROLLUP_FILE = resource_path(os.path.join("data", "rollup.json"))
+BACKGROUND_ROLLUP_FILE = resource_path(os.path.join("data", "background_rollup.json"))
+METRICS_FILE = resource_path(os.path.join("data", "metrics.json"))
+BACKGROUND_DATA_FILE = resource_path(os.path.join("data", "background_data.json"))
+IDLE_THRESHOLD = 45
+MINIMUM_ACTIVITY_DURATION = 15
+CONFIG_RELOAD_INTERVAL = 5
+RESTART_DELAY = 1
+RESTART_DELAY_MAX = 60
+BACKGROUND_STOP_TIMEOUT = 5
+
+def load_config():
+    try:
+        with open(CONFIG_FILE, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"apps_to_track": []}
+
+# Storage and the rollup index are opened on first use, so commands that
+# never touch session data (stop, team-report, ...) do no file work
+_opened = {}
+_opened_lock = threading.RLock()
+
+def _open(name, opener):
+    with _opened_lock:
+        if name not in _opened:
+            os.makedirs(DATA_DIR, exist_ok=True)
+            _opened[name] = opener()
+        return _opened[name]
+
+def get_storage():
+    return _open("storage", lambda: open_storage(load_config(), DATA_FILE))
+
+def get_rollup():
+    return _open("rollup", lambda: RollupIndex.open(ROLLUP_FILE, get_storage()))
+
+def get_background_storage():
+    # Background sessions carry CPU seconds, so they always use the JSON journal
+    return _open("background_storage", lambda: JournalStorage(BACKGROUND_DATA_FILE))
+
+def get_background_rollup():
+    return _open("background_rollup", lambda: RollupIndex.open(BACKGROUND_ROLLUP_FILE, get_background_storage()))
+
+def close_storage():
+    with _opened_lock:
+        for name in ("rollup", "background_rollup", "storage", "background_storage"):
+            if name in _opened:
+                _opened.pop(name).close()
+
+def load_data(start_date=None, end_date=None, app=None):
+    if start_date is None:
+        return get_storage().load()
+    return get_storage().load_range(start_date, end_date, app)
+
+def save_data(data):
+    with metrics.timed("save_data"):
+        get_storage().replace(data)
+        get_rollup().rebuild(data)
+
+def get_idle_duration():
+    if sys.platform != "win32":
+        # No idle source off Windows; treat the user as active
+        return 0
+
+    class LASTINPUTINFO(ctypes.Structure):
+        _fields_ = [
+            ('cbSize', ctypes.c_uint),
+            ('dwTime', ctypes.c_int),
+        ]
+
+    lastInputInfo = LASTINPUTINFO()
+    lastInputInfo.cbSize = ctypes.sizeof(LASTINPUTINFO)
+    if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(lastInputInfo)):
+        return 0
+    millis = win32api.GetTickCount() - lastInputInfo.dwTime
+    return millis / 1000.0
+
+class TimeTracker:
+    def __init__(self, session_storage=None, rollup_index=None):
+        self.storage = session_storage if session_storage is not None else get_storage()
+        self.rollup = rollup_index if rollup_index is not None else get_rollup()
+        self.config_mtime = None
+        self.config_checked_at = 0
+        self.reload_config()
+        self.recorder = None
+        self.listeners = []
+        self.background = None
+        self.background_thread = None
+        self.last_app = None
+        self.app_start_time = None
+        self.last_sample_time = None
+        self.is_tracking = False
+        self.backend = None
+        self.scheduler = None
+        self.stopped = threading.Event()
+        self.clock = time.monotonic
+        self.wall_clock = time.time
+
+    def reload_config(self):
+        try:
+            mtime = os.path.getmtime(CONFIG_FILE)
+        except OSError:
+            mtime = None
+        if mtime == self.config_mtime and self.config_mtime is not None:
+            return False
+        config = load_config()
+        self.apps_to_track = config.get("apps_to_track", [])
+        self.matcher = AppMatcher.from_config(config)
+        self.config_mtime = mtime
+        return True
+
+    def maybe_reload_config(self, now):
+        if now - self.config_checked_at >= CONFIG_RELOAD_INTERVAL:
+            self.config_checked_at = now
+            self.reload_config()
+
+    def add_listener(self, listener):
+        # Listeners are called as listener(event, *args) on the thread that
+        # caused the event: "tracking" (active), "session_started" (app,
+        # start), "session_logged" (app, date, duration), "session_ended"
+        # (app) and "notify" (title, message).
+        self.listeners.append(listener)
+
+    def emit(self, event, *args):
+        for listener in self.listeners:
+            try:
+                listener(event, *args)
+            except Exception as e:
+                print(f"Listener Error: {e}")
+
+    def match_app(self, active_process):
+        return self.matcher.match(active_process)
+
+    def process_sample(self, active_process, idle_duration, now=None):
+        # `now` is on the monotonic clock; wall time is only used when logging
+        now = self.clock() if now is None else now
+        with metrics.timed("match"):
+            active_app = self.match_app(active_process)
+        last_sample = self.last_sample_time if self.last_sample_time is not None else now
+        self.last_sample_time = now
+
+        if active_app and idle_duration <= IDLE_THRESHOLD:
+            if active_app != self.last_app:
+                if self.last_app:
+                    self.log_time(self.last_app, now)
+                    self.emit("session_ended", self.last_app)
+                    self.app_start_time = now
+                else:
+                    # Back-date to the first input, which may have landed
+                    # between two (possibly backed-off) samples
+                    self.app_start_time = max(now - idle_duration, last_sample)
+                self.last_app = active_app
+                self.emit("session_started", active_app, self.app_start_time)
+        else:
+            if self.last_app:
+                # The session ends once the threshold passed, however late
+                # the idle was noticed
+                end = now - max(idle_duration - IDLE_THRESHOLD, 0) if active_app else now
+                end = max(end, self.app_start_time)
+                elapsed_time = end - self.app_start_time
+                if elapsed_time >= MINIMUM_ACTIVITY_DURATION:
+                    self.log_time(self.last_app, end)
+                self.emit("session_ended", self.last_app)
+                self.last_app = None
+                self.app_start_time = None
+        return active_app
+
+    def metrics_extra(self):
+        return {"scheduler": self.scheduler.stats()} if self.scheduler else {}
+
+    def run_loop(self):
+        while self.is_tracking:
+            tick_time = self.scheduler.tick()
+            lateness = self.scheduler.last_lateness
+            if lateness is not None:
+                metrics.observe("tick_jitter", lateness)
+                if lateness > DROPPED_TICK_LATENESS:
+                    metrics.count("dropped_ticks")
+            self.maybe_reload_config(tick_time)
+            with metrics.timed("idle_query"):
+                idle_duration = get_idle_duration()
+            if self.recorder:
+                self.recorder.record(tick_time, self.backend.current, idle_duration)
+            active_app = self.process_sample(self.backend.current, idle_duration, tick_time)
+            active = active_app is not None and idle_duration <= IDLE_THRESHOLD
+            self.scheduler.schedule(tick_time, self.scheduler.next_delay(active_app is not None, active, idle_duration))
+            timeout = self.scheduler.timeout()
+            if timeout is None:
+                # Nothing tracked in front: still wake to notice config edits,
+                # e.g. the foreground app being added to apps_to_track
+                timeout = CONFIG_RELOAD_INTERVAL
+            self.backend.wait(timeout)
+
+    def start_tracking(self, backend=None):
+        # Supervises run_loop: an error restarts the loop (with back-off)
+        # instead of silently ending tracking.
+        self.is_tracking = True
+        self.stopped.clear()
+        self.scheduler = PollScheduler.from_config(load_config(), IDLE_THRESHOLD, self.clock)
+        self.rollup.begin(self.storage)
+        writer = MetricsWriter(metrics, METRICS_FILE, extra=self.metrics_extra)
+        writer.start()
+        self.start_background()
+        self.emit("tracking", True)
+        restart_delay = RESTART_DELAY
+
+        while self.is_tracking:
+            started = self.clock()
+            try:
+                self.backend = backend or create_backend(self.get_active_process_name)
+                self.backend.start()
+                self.run_loop()
+            except Exception as e:
+                print(f"Tracking Error: {e}")
+                metrics.count("errors")
+                if self.clock() - started > RESTART_DELAY_MAX:
+                    restart_delay = RESTART_DELAY
+                if self.is_tracking:
+                    metrics.count("restarts")
+                    self.emit("notify", "Time Trakk", f"Tracking restarted after an error: {e}")
+                    self.stopped.wait(restart_delay)
+                    restart_delay = min(restart_delay * 2, RESTART_DELAY_MAX)
+            finally:
+                if self.backend:
+                    self.backend.stop()
+        writer.stop()
+
+    def start_background(self):
+        config = load_config()
+        if not config.get("background", {}).get("enabled"):
+            return
+        background_rollup = get_background_rollup()
+        background_rollup.begin(get_background_storage())
+        # The scanner copies the current matcher, so config reloads apply
+        self.background = BackgroundTracker.from_config(
+            config, lambda: self.matcher, get_background_storage(), background_rollup, self.clock, self.wall_clock
+        )
+        self.background_thread = threading.Thread(
+            target=self.background.run, args=(self.stopped,), name="TimeTrakkBackground", daemon=True
+        )
+        self.background_thread.start()
+
+    def stop_tracking(self):
+        self.is_tracking = False
+        self.stopped.set()
+        if self.backend:
+            self.backend.stop()
+        if self.background_thread:
+            # Lets the scanner close its open sessions before storage closes
+            self.background_thread.join(BACKGROUND_STOP_TIMEOUT)
+            self.background_thread = None
+        if self.last_app and self.app_start_time is not None:
+            self.log_time(self.last_app)
+            self.emit("session_ended", self.last_app)
+            self.last_app = None
+            self.app_start_time = None
+        self.emit("tracking", False)
+
+    def log_time(self, app_name, now=None):
+        now = self.clock() if now is None else now
+        elapsed_time = int(now - self.app_start_time)
+        wall_end = self.wall_clock() - (self.clock() - now)
+        start = int(wall_end) - elapsed_time
+
+        # Sessions crossing midnight are logged as one piece per day
+        with metrics.timed("log_time"):
+            for piece_start, piece_duration in split_at_midnight(start, elapsed_time):
+                date_str, session = session_entry(piece_start, piece_duration)
+                self.storage.append(date_str, app_name, session)
+                self.rollup.add(date_str, app_name, piece_duration)
+                self.emit("session_logged", app_name, date_str, piece_duration)
+
+    def get_active_process_name(self):
+        try:
+            if sys.platform == "win32":
+                return process_name_for_window(win32gui.GetForegroundWindow())
+            else:
+                import pygetwindow as gw  # Only needed by the polling fallback
+                active_window = gw.getActiveWindow()
+                return active_window.title if active_window else None
+        except Exception as e:
+            print(f"Process Retrieval Error: {e}")
+            metrics.count("foreground_errors")
+            return None
+
+    def generate_report(self, force=False):
+        return generate_report(force)
+
+    def generate_summary(self):
+        return generate_summary()
+
+
+def generate_analytics(days=None):
+    from trakk import analytics  # NumPy is only needed for analytics
+    if days is None:
+        return analytics.analyze(SessionStore.from_dict(load_data()))
+    # SQLite answers this from the start timestamp index
+    return analytics.analyze(SessionStore.from_dict(get_storage().load_since(time.time() - days * 86400)))
+
+
+def generate_report(force=False, with_analytics=False):
+    try:
+        with metrics.timed("report"):
+            builder = ReportBuilder(get_storage(), get_rollup(), HTML_REPORT_FILE)
+            if with_analytics:
+                from trakk.analytics import html_sections  # NumPy is only needed for analytics
+                builder.write_analytics(html_sections(generate_analytics()))
+            return builder.build(force)
+    except Exception as e:
+        print(f"Report Generation Error: {e}")
+        metrics.count("errors")
+
+
+def format_duration(total_duration):
+    hours, remainder = divmod(total_duration, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    duration_str = ""
+    if hours > 0:
+        duration_str += f"{hours} hour{'s' if hours != 1 else ''} "
+    if minutes > 0:
+        duration_str += f"{minutes} minute{'s' if minutes != 1 else ''} "
+    if seconds > 0:
+        duration_str += f"{seconds} second{'s' if seconds != 1 else ''}"
+    return duration_str.strip()
+
+
+def background_totals(date_str):
+    index = get_background_rollup()
+    cpu = index.app_cpu(date_str)
+    return {app: (total, cpu.get(app, 0)) for app, total in index.app_totals(date_str).items()}
+
+
+def generate_summary(date_str=None):
+    date_str = date_str or datetime.now().strftime("%Y-%m-%d")
+    rollup = get_rollup()
+    summary_lines = []
+    for app, total_duration in rollup.app_totals(date_str).items():
+        summary_lines.append(f"{app}: {format_duration(total_duration)}")
+    if summary_lines:
+        summary_lines.append(f"This week: {format_duration(rollup.week_total(date_str))}")
+        summary_lines.append(f"This month: {format_duration(rollup.month_total(date_str))}")
+    for app, (total_duration, cpu) in background_totals(date_str).items():
+        summary_lines.append(f"{app} (background): {format_duration(total_duration)}, {format_duration(int(cpu)) or '0 seconds'} CPU")
+    return "\n".join(summary_lines)
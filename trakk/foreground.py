@@ -0,0 +1,226 @@
+# Foreground-window change detection backends
+
+import os  # Operating system functions
+import sys  # System-specific parameters and functions
+import queue  # Queue data structure
+import select  # Waiting on file descriptors
+import threading  # Threading support
+import ctypes  # C types for interacting with DLLs
+from trakk.matcher import WindowProcessCache  # Per-window process name cache
+from trakk.metrics import metrics  # Hot-path instrumentation
+
+if sys.platform == "win32":
+    from ctypes import wintypes
+    import win32gui
+    import win32process
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+WINEVENT_OUTOFCONTEXT = 0x0000
+WM_QUIT = 0x0012
+
+_WAKE = object()
+
+window_processes = WindowProcessCache()
+
+
+def process_name_for_window(hwnd):
+    if not hwnd:
+        return None
+    with metrics.timed("foreground_lookup"):
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        return window_processes.lookup(hwnd, pid)
+
+
+class ForegroundBackend:
+    """Reports the foreground application and wakes waiters when it changes.
+
+    Backends push foreground names from their own thread; the tracker calls
+    ``wait`` with the longest time it can sleep and reads ``current`` after.
+    """
+
+    def __init__(self):
+        self.events = queue.Queue()
+        self.current = None
+
+    def start(self):
+        pass
+
+    def stop(self):
+        self.events.put(_WAKE)
+
+    def post(self, name):
+        self.events.put(name)
+
+    def wait(self, timeout=None):
+        # Returns True when woken by a change (or stop), False on timeout
+        try:
+            item = self.events.get(timeout=timeout)
+        except queue.Empty:
+            return False
+        while True:
+            if item is not _WAKE:
+                self.current = item
+            try:
+                item = self.events.get_nowait()
+            except queue.Empty:
+                return True
+
+
+class PollingBackend(ForegroundBackend):
+    def __init__(self, resolve, interval=1.0):
+        super().__init__()
+        self.resolve = resolve
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def start(self):
+        self._stopped.clear()
+        self.current = self.resolve()
+        threading.Thread(target=self._run, name="TimeTrakkPoll", daemon=True).start()
+
+    def _run(self):
+        last = self.current
+        while not self._stopped.wait(self.interval):
+            name = self.resolve()
+            if name != last:
+                last = name
+                self.post(name)
+
+    def stop(self):
+        self._stopped.set()
+        super().stop()
+
+
+class WinEventBackend(ForegroundBackend):
+    def __init__(self):
+        super().__init__()
+        self._thread_id = None
+        self._ready = threading.Event()
+
+    def start(self):
+        self.current = self._resolve(win32gui.GetForegroundWindow())
+        self._ready.clear()
+        threading.Thread(target=self._run, name="TimeTrakkWinEvent", daemon=True).start()
+        self._ready.wait()
+
+    def _resolve(self, hwnd):
+        try:
+            return process_name_for_window(hwnd)
+        except Exception as e:
+            print(f"Process Retrieval Error: {e}")
+            metrics.count("foreground_errors")
+            return None
+
+    def _run(self):
+        user32 = ctypes.windll.user32
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+
+        def callback(hook, event, hwnd, id_object, id_child, thread, event_time):
+            self.post(self._resolve(hwnd))
+
+        # Keep a reference so the callback is not collected while hooked
+        self._callback = WinEventProc(callback)
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        hook = user32.SetWinEventHook(
+            EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, 0,
+            self._callback, 0, 0, WINEVENT_OUTOFCONTEXT
+        )
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        self._ready.set()
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        user32.UnhookWinEvent(hook)
+
+    def stop(self):
+        if self._thread_id:
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            self._thread_id = None
+        super().stop()
+
+
+class X11Backend(ForegroundBackend):
+    def __init__(self):
+        super().__init__()
+        from Xlib import X, display  # Imported lazily, python-xlib is optional
+        self.X = X
+        self.display = display.Display()
+        self.root = self.display.screen().root
+        self.NET_ACTIVE_WINDOW = self.display.intern_atom('_NET_ACTIVE_WINDOW')
+        self.NET_WM_NAME = self.display.intern_atom('_NET_WM_NAME')
+        self.UTF8_STRING = self.display.intern_atom('UTF8_STRING')
+        self._wake_r, self._wake_w = os.pipe()
+
+    def start(self):
+        self.root.change_attributes(event_mask=self.X.PropertyChangeMask)
+        self.current = self._active_title()
+        threading.Thread(target=self._run, name="TimeTrakkX11", daemon=True).start()
+
+    def _active_title(self):
+        with metrics.timed("foreground_lookup"):
+            return self._read_active_title()
+
+    def _read_active_title(self):
+        try:
+            prop = self.root.get_full_property(self.NET_ACTIVE_WINDOW, self.X.AnyPropertyType)
+            if not prop or not prop.value or not prop.value[0]:
+                return None
+            window = self.display.create_resource_object('window', prop.value[0])
+            name = window.get_full_property(self.NET_WM_NAME, self.UTF8_STRING)
+            if name and name.value:
+                value = name.value
+                return value.decode('utf-8', 'replace') if isinstance(value, bytes) else value
+            return window.get_wm_name()
+        except Exception as e:
+            print(f"Process Retrieval Error: {e}")
+            metrics.count("foreground_errors")
+            return None
+
+    def _run(self):
+        fd = self.display.fileno()
+        while True:
+            readable, _, _ = select.select([fd, self._wake_r], [], [])
+            if self._wake_r in readable:
+                return
+            while self.display.pending_events():
+                event = self.display.next_event()
+                if event.type == self.X.PropertyNotify and event.atom == self.NET_ACTIVE_WINDOW:
+                    self.post(self._active_title())
+
+    def stop(self):
+        os.write(self._wake_w, b"x")
+        super().stop()
+
+
+class FakeBackend(ForegroundBackend):
+    """Scripted backend for driving the tracker without a display."""
+
+    def __init__(self, current=None):
+        super().__init__()
+        self.current = current
+        self.waits = []
+
+    def push(self, name):
+        self.post(name)
+
+    def wait(self, timeout=None):
+        self.waits.append(timeout)
+        return super().wait(timeout)
+
+
+def create_backend(resolve, poll_interval=1.0):
+    try:
+        if sys.platform == "win32":
+            return WinEventBackend()
+        if sys.platform.startswith("linux"):
+            if not os.environ.get("DISPLAY"):
+                # Headless host (render node): nothing is ever in the foreground
+                return ForegroundBackend()
+            return X11Backend()
+    except Exception as e:
+        print(f"Foreground hook unavailable, falling back to polling: {e}")
+    return PollingBackend(resolve, poll_interval)
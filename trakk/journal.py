@@ -0,0 +1,158 @@
+# Append-only session journal with periodic compaction into a JSON snapshot
+
+import os  # Operating system functions
+import json  # JSON handling
+import queue  # Queue data structure
+import threading  # Threading support
+
+COMPACT_EVERY = 500
+
+
+def read_json(path, default):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def write_json_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SessionJournal:
+    """Keeps the history as a snapshot file plus an append-only journal.
+
+    The snapshot uses the original ``time_data.json`` layout, so an existing
+    history file is adopted as-is on first start. Each logged session becomes a
+    single compact JSON line in the journal, written by a background thread;
+    every ``compact_every`` records the journal is folded into a new snapshot
+    which replaces the old one with an atomic rename.
+    """
+
+    def __init__(self, snapshot_path, journal_path=None, compact_every=COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + ".journal"
+        self.compact_every = compact_every
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = self._count_journal_records()
+        self._torn_tail = self._has_torn_tail()
+        self._writer = None
+
+    def _count_journal_records(self):
+        try:
+            with open(self.journal_path, 'rb') as f:
+                return sum(1 for _ in f)
+        except FileNotFoundError:
+            return 0
+
+    def _has_torn_tail(self):
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except FileNotFoundError:
+            return False
+
+    def _ensure_writer(self):
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._run, name="TimeTrakkJournal", daemon=True)
+            self._writer.start()
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            try:
+                if record is None:
+                    return
+                with self._lock:
+                    self._write_record(record)
+                    if self._pending >= self.compact_every:
+                        self._compact()
+            except Exception as e:
+                print(f"Journal Write Error: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write_record(self, record):
+        line = json.dumps(record, separators=(',', ':')) + "\n"
+        if self._torn_tail:
+            # Terminate a partial line left by a crash so it stays isolated
+            line = "\n" + line
+            self._torn_tail = False
+        with open(self.journal_path, 'a') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending += 1
+
+    def _replay(self, data):
+        # Journal records already present in the snapshot are skipped, which
+        # covers a crash between writing a snapshot and truncating the journal.
+        seen = {}
+        try:
+            with open(self.journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        date_str, app_name, session = json.loads(line)
+                    except ValueError:
+                        # A torn final line from an interrupted write
+                        continue
+                    sessions = data.setdefault(date_str, {}).setdefault(app_name, [])
+                    key = (date_str, app_name)
+                    if key not in seen:
+                        seen[key] = {tuple(sorted(s.items())) for s in sessions}
+                    fingerprint = tuple(sorted(session.items()))
+                    if fingerprint in seen[key]:
+                        continue
+                    seen[key].add(fingerprint)
+                    sessions.append(session)
+        except FileNotFoundError:
+            pass
+        return data
+
+    def _compact(self, data=None):
+        if data is None:
+            data = self._replay(read_json(self.snapshot_path, {}))
+        write_json_atomic(self.snapshot_path, data)
+        with open(self.journal_path, 'w'):
+            pass
+        self._pending = 0
+        self._torn_tail = False
+
+    def append(self, date_str, app_name, session):
+        self._ensure_writer()
+        self._queue.put([date_str, app_name, session])
+
+    def flush(self):
+        self._queue.join()
+
+    def load(self):
+        self.flush()
+        with self._lock:
+            return self._replay(read_json(self.snapshot_path, {}))
+
+    def replace(self, data):
+        self.flush()
+        with self._lock:
+            self._compact(data)
+
+    def compact(self):
+        self.flush()
+        with self._lock:
+            self._compact()
+
+    def close(self):
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._writer = None
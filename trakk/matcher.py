@@ -0,0 +1,143 @@
+# Compiled tracked-app matching and per-window process caching
+
+import re  # Regular expressions
+import copy  # Shallow matcher copies
+import fnmatch  # Shell-style pattern translation
+import psutil  # System and process utilities
+from collections import OrderedDict  # Ordered mapping for LRU caches
+
+CACHE_SIZE = 256
+
+
+class LRUCache:
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            return default
+        return self._entries[key]
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key):
+        self._entries.pop(key, None)
+
+    def items(self):
+        return list(self._entries.items())
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class AppMatcher:
+    """Matches process names against the tracked app rules in one pass.
+
+    ``executables`` maps exact executable names and ``patterns`` maps glob
+    patterns to app names; both are checked before the ``apps_to_track``
+    substring rules. Substring rules keep the config order as priority, just
+    like the original list scan.
+    """
+
+    _MISS = object()
+
+    def __init__(self, apps_to_track, executables=None, patterns=None, cache_size=CACHE_SIZE):
+        self.apps_to_track = list(apps_to_track)
+        self.executables = {exe.lower(): app for exe, app in (executables or {}).items()}
+        self.patterns = [
+            (re.compile(fnmatch.translate(pattern.lower())), app)
+            for pattern, app in (patterns or {}).items()
+        ]
+        self.priority = {}
+        for index, app in enumerate(self.apps_to_track):
+            self.priority.setdefault(app.lower(), (index, app))
+        if self.priority:
+            # Alternatives in config order make each position report its
+            # highest-priority app; the lookahead allows overlapping matches.
+            alternatives = sorted(self.priority, key=lambda name: self.priority[name][0])
+            self.substring_re = re.compile("(?=(" + "|".join(map(re.escape, alternatives)) + "))")
+        else:
+            self.substring_re = None
+        self.cache = LRUCache(cache_size)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            config.get("apps_to_track", []),
+            config.get("executables"),
+            config.get("patterns")
+        )
+
+    def copy(self):
+        # Shares the compiled rules with a cache of its own; LRUCache is not
+        # safe to share between threads
+        matcher = copy.copy(self)
+        matcher.cache = LRUCache(self.cache.maxsize)
+        return matcher
+
+    def _match(self, lowered):
+        app = self.executables.get(lowered)
+        if app:
+            return app
+        for pattern, app in self.patterns:
+            if pattern.match(lowered):
+                return app
+        if self.substring_re is None:
+            return None
+        best = None
+        for m in self.substring_re.finditer(lowered):
+            candidate = self.priority[m.group(1)]
+            if best is None or candidate < best:
+                best = candidate
+        return best[1] if best else None
+
+    def match(self, process_name):
+        if not process_name:
+            return None
+        app = self.cache.get(process_name, self._MISS)
+        if app is self._MISS:
+            app = self._match(process_name.lower())
+            self.cache.put(process_name, app)
+        return app
+
+
+class WindowProcessCache:
+    """Remembers the process name behind each (window handle, pid) pair.
+
+    Entries carry the process create time; whenever a lookup misses, entries
+    whose process has exited (or whose pid was reused) are dropped.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.cache = LRUCache(maxsize)
+
+    def lookup(self, hwnd, pid):
+        entry = self.cache.get((hwnd, pid))
+        if entry is not None:
+            return entry[0]
+        process = psutil.Process(pid)
+        with process.oneshot():
+            name = process.name()
+            create_time = process.create_time()
+        self.prune()
+        self.cache.put((hwnd, pid), (name, create_time))
+        return name
+
+    def prune(self):
+        for key, (name, create_time) in self.cache.items():
+            try:
+                alive = psutil.Process(key[1]).create_time() == create_time
+            except psutil.Error:
+                alive = False
+            if not alive:
+                self.cache.pop(key)
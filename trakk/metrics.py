@@ -0,0 +1,166 @@
+# Hot-path instrumentation: latency histograms, counters and a metrics file
+
+import time  # Time-related functions
+import bisect  # Histogram bucket lookup
+import threading  # Threading support
+from contextlib import contextmanager  # Timing context manager
+import psutil  # System and process utilities
+from trakk.journal import write_json_atomic  # Atomic JSON writes
+
+# Bucket upper bounds in seconds: 1 µs .. ~17 s, doubling
+BUCKETS = [1e-6 * 2 ** i for i in range(25)]
+WRITE_INTERVAL = 10
+DROPPED_TICK_LATENESS = 1.0
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(BUCKETS[index], self.max) if index < len(BUCKETS) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 4) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.5) * 1000, 4),
+            "p90_ms": round(self.quantile(0.9) * 1000, 4),
+            "p99_ms": round(self.quantile(0.99) * 1000, 4),
+            "max_ms": round(self.max * 1000, 4)
+        }
+
+
+class Metrics:
+    """Process-wide latency histograms per stage plus named counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.histograms = {}
+        self.counters = {}
+        self.process = psutil.Process()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timed(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def process_stats(self):
+        with self.process.oneshot():
+            cpu = self.process.cpu_times()
+            return {
+                "pid": self.process.pid,
+                "cpu_user_s": round(cpu.user, 3),
+                "cpu_system_s": round(cpu.system, 3),
+                "cpu_percent": self.process.cpu_percent(),
+                "rss_mb": round(self.process.memory_info().rss / (1 << 20), 2),
+                "threads": self.process.num_threads()
+            }
+
+    def snapshot(self, extra=None):
+        with self._lock:
+            result = {
+                "written_at": time.time(),
+                "uptime": round(time.time() - self.started_at, 3),
+                "stages": {stage: histogram.snapshot() for stage, histogram in sorted(self.histograms.items())},
+                "counters": dict(sorted(self.counters.items()))
+            }
+        result["process"] = self.process_stats()
+        if extra:
+            result.update(extra)
+        return result
+
+
+class MetricsWriter:
+    """Rewrites the metrics file periodically from a background thread."""
+
+    def __init__(self, metrics, path, interval=WRITE_INTERVAL, extra=None):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.extra = extra
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def write(self):
+        try:
+            write_json_atomic(self.path, self.metrics.snapshot(self.extra() if self.extra else None))
+        except Exception as e:
+            print(f"Metrics Write Error: {e}")
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.write()
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="TimeTrakkMetrics", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+
+def format_metrics(snapshot):
+    lines = [f"Uptime: {snapshot['uptime']:.0f}s (written {time.ctime(snapshot['written_at'])})"]
+    process = snapshot.get("process", {})
+    if process:
+        lines.append(
+            f"Process {process['pid']}: CPU {process['cpu_user_s'] + process['cpu_system_s']:.2f}s "
+            f"({process['cpu_percent']}%), RSS {process['rss_mb']} MB, {process['threads']} threads"
+        )
+    scheduler = snapshot.get("scheduler")
+    if scheduler:
+        lines.append(
+            f"Ticks: {scheduler['ticks']} ({scheduler['tick_rate']}/s), "
+            f"mean lateness {scheduler['mean_lateness'] * 1000:.1f} ms, max {scheduler['max_lateness'] * 1000:.1f} ms"
+        )
+    for name, value in snapshot.get("counters", {}).items():
+        lines.append(f"{name}: {value}")
+    for stage, stats in snapshot.get("stages", {}).items():
+        lines.append(
+            f"{stage:<20} n={stats['count']:<8} mean={stats['mean_ms']}ms "
+            f"p50={stats['p50_ms']}ms p90={stats['p90_ms']}ms p99={stats['p99_ms']}ms max={stats['max_ms']}ms"
+        )
+    return "\n".join(lines)
+
+
+metrics = Metrics()
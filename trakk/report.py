@@ -0,0 +1,121 @@
+# Partitioned HTML activity report: one page per month plus an index page
+
+import os  # Operating system functions
+import json  # JSON handling
+import hashlib  # Content hashing
+from html import escape  # HTML escaping
+from trakk.journal import read_json, write_json_atomic  # JSON file helpers
+
+ANALYTICS_PAGE = "analytics.html"
+
+
+def format_hms(total):
+    hours, remainder = divmod(total, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours}h {minutes}m {seconds}s"
+
+
+def month_hash(month_data):
+    digest = hashlib.sha1()
+    for date_str in sorted(month_data):
+        digest.update(json.dumps([date_str, month_data[date_str]], sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class StreamingPage:
+    """Writes an HTML page chunk by chunk to a temp file, then swaps it in."""
+
+    def __init__(self, path, title):
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        self.f = open(self.tmp_path, 'w', encoding='utf-8')
+        self.write(f"<html><head><meta charset=\"utf-8\"><title>{escape(title)}</title></head><body>")
+
+    def write(self, chunk):
+        self.f.write(chunk)
+
+    def close(self):
+        self.write("</body></html>")
+        self.f.close()
+        os.replace(self.tmp_path, self.path)
+
+
+class ReportBuilder:
+    def __init__(self, storage, rollup, report_file):
+        self.storage = storage
+        self.rollup = rollup
+        self.report_file = report_file
+        self.pages_dir = os.path.splitext(report_file)[0]
+        self.manifest_file = os.path.join(self.pages_dir, "manifest.json")
+
+    def page_name(self, month):
+        return f"{month}.html"
+
+    def write_month(self, month, month_data):
+        page = StreamingPage(os.path.join(self.pages_dir, self.page_name(month)), f"Activity Report {month}")
+        page.write(f"<p><a href=\"../{escape(os.path.basename(self.report_file))}\">All months</a></p>")
+        page.write(f"<h1>Activity Report {month}</h1>")
+        for date_str in sorted(month_data):
+            apps = month_data[date_str]
+            page.write(f"<h2>{date_str}, You worked for a total of {format_hms(self.rollup.day_total(date_str))}</h2>")
+            app_totals = self.rollup.app_totals(date_str)
+            for app, sessions in apps.items():
+                page.write(f"<h3>{escape(app)}</h3><p>Total time: {format_hms(app_totals.get(app, 0))}</p><ul>")
+                page.write("".join(
+                    f"<li>{session['start']} - {session['end']} ({session['duration']}s)</li>"
+                    for session in sessions
+                ))
+                page.write("</ul>")
+        page.close()
+
+    def write_analytics(self, sections_html):
+        os.makedirs(self.pages_dir, exist_ok=True)
+        page = StreamingPage(os.path.join(self.pages_dir, ANALYTICS_PAGE), "Activity Analytics")
+        page.write(f"<p><a href=\"../{escape(os.path.basename(self.report_file))}\">All months</a></p>")
+        page.write("<h1>Activity Analytics</h1>")
+        page.write(sections_html)
+        page.close()
+
+    def write_index(self, months):
+        page = StreamingPage(self.report_file, "Activity Report")
+        page.write("<h1>Activity Report</h1>")
+        pages_link = escape(os.path.basename(self.pages_dir))
+        if os.path.exists(os.path.join(self.pages_dir, ANALYTICS_PAGE)):
+            page.write(f"<p><a href=\"{pages_link}/{ANALYTICS_PAGE}\">Analytics</a></p>")
+        page.write("<ul>")
+        for month in months:
+            page.write(
+                f"<li><a href=\"{pages_link}/{self.page_name(month)}\">{month}</a>"
+                f" - {format_hms(self.rollup.month_total(month))}</li>"
+            )
+        page.write("</ul>")
+        page.close()
+
+    def build(self, force=False):
+        # Storage month versions change whenever a month's sessions change;
+        # only months whose version moved are loaded, hashed and rewritten.
+        os.makedirs(self.pages_dir, exist_ok=True)
+        manifest = {} if force else read_json(self.manifest_file, {})
+        months = sorted(self.rollup.totals["months"], reverse=True)
+        versions = self.storage.month_versions(months)
+        stale = []
+        for month in months:
+            entry = manifest.get(month)
+            page_path = os.path.join(self.pages_dir, self.page_name(month))
+            if not entry or versions.get(month) is None or entry.get("version") != versions.get(month) \
+                    or not os.path.exists(page_path):
+                stale.append(month)
+        regenerated = []
+        for month, month_data in self.storage.load_months(stale):
+            entry = manifest.get(month)
+            content_hash = month_hash(month_data)
+            page_path = os.path.join(self.pages_dir, self.page_name(month))
+            if not entry or entry.get("hash") != content_hash or not os.path.exists(page_path):
+                self.write_month(month, month_data)
+                regenerated.append(month)
+            manifest[month] = {"hash": content_hash, "version": versions.get(month)}
+        for month in set(manifest) - set(months):
+            del manifest[month]
+        self.write_index(months)
+        write_json_atomic(self.manifest_file, manifest)
+        return regenerated
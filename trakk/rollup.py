@@ -0,0 +1,169 @@
+# Incrementally maintained totals per day, app, ISO week and month
+
+import os  # Operating system functions
+import sys  # System-specific parameters and functions
+import threading  # Threading support
+from datetime import date  # Calendar dates
+from trakk.journal import read_json, write_json_atomic  # JSON file helpers
+
+SAVE_DELAY = 10
+
+
+def week_key(date_str):
+    year, week, _ = date.fromisoformat(date_str).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def month_key(date_str):
+    return date_str[:7]
+
+
+class RollupIndex:
+    """Running duration totals, updated as each session is logged.
+
+    The index is a small JSON file next to the session data, so summaries can
+    read totals without loading the session history. ``add`` only updates
+    memory; the file is rewritten by a timer thread at most every
+    ``SAVE_DELAY`` seconds and once more on ``close``. While a tracker owns
+    the index the file is marked unclean, so totals left behind by a crash
+    are rebuilt from the sessions when the next tracker starts.
+    """
+
+    def __init__(self, path, totals=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._timer = None
+        self.active = False
+        totals = totals or self.empty()
+        self.clean = totals.pop("clean", True)
+        self.totals = totals
+
+    @staticmethod
+    def empty():
+        return {"days": {}, "apps": {}, "weeks": {}, "months": {}}
+
+    @classmethod
+    def open(cls, path, storage):
+        totals = read_json(path, None)
+        index = cls(path, totals)
+        if totals is None:
+            index.rebuild(storage.load())
+        return index
+
+    @classmethod
+    def compute(cls, data):
+        index = cls(None)
+        for date_str, apps in data.items():
+            for app_name, sessions in apps.items():
+                for session in sessions:
+                    index._add(date_str, app_name, session['duration'], session.get('cpu'))
+        return index.totals
+
+    def _add(self, date_str, app_name, duration, cpu=None):
+        totals = self.totals
+        totals["days"][date_str] = totals["days"].get(date_str, 0) + duration
+        day_apps = totals["apps"].setdefault(date_str, {})
+        day_apps[app_name] = day_apps.get(app_name, 0) + duration
+        week = week_key(date_str)
+        totals["weeks"][week] = totals["weeks"].get(week, 0) + duration
+        month = month_key(date_str)
+        totals["months"][month] = totals["months"].get(month, 0) + duration
+        if cpu is not None:
+            # Only background sessions carry CPU seconds
+            day_cpu = totals.setdefault("cpu", {}).setdefault(date_str, {})
+            day_cpu[app_name] = round(day_cpu.get(app_name, 0) + cpu, 1)
+
+    def add(self, date_str, app_name, duration, cpu=None):
+        with self._lock:
+            self._add(date_str, app_name, duration, cpu)
+            if self.path and self._timer is None:
+                self._timer = threading.Timer(SAVE_DELAY, self._deferred_save)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _deferred_save(self):
+        with self._lock:
+            # A timer cancelled while waiting for the lock has nothing to do
+            if self._timer is threading.current_thread():
+                self._save()
+
+    def _save(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.path:
+            write_json_atomic(self.path, dict(self.totals, clean=not self.active))
+
+    def begin(self, storage):
+        # Called by the tracker before it starts adding sessions
+        if self.active:
+            return
+        if not self.clean:
+            self.rebuild(storage.load())
+        with self._lock:
+            self.active = True
+            self._save()
+
+    def close(self):
+        with self._lock:
+            if self.active or self._timer is not None:
+                self.active = False
+                self._save()
+                self.clean = True
+
+    def rebuild(self, data):
+        totals = self.compute(data)
+        with self._lock:
+            self.totals = totals
+            self._save()
+            self.clean = not self.active
+
+    def verify(self, data):
+        expected = self.compute(data)
+        mismatches = []
+        with self._lock:
+            for section, values in expected.items():
+                actual = self.totals.get(section, {})
+                for key in sorted(set(values) | set(actual)):
+                    if values.get(key) != actual.get(key):
+                        mismatches.append((section, key, actual.get(key), values.get(key)))
+        return mismatches
+
+    def day_total(self, date_str):
+        return self.totals["days"].get(date_str, 0)
+
+    def app_totals(self, date_str):
+        return dict(self.totals["apps"].get(date_str, {}))
+
+    def app_cpu(self, date_str):
+        return dict(self.totals.get("cpu", {}).get(date_str, {}))
+
+    def week_total(self, date_str):
+        return self.totals["weeks"].get(week_key(date_str), 0)
+
+    def month_total(self, date_str):
+        return self.totals["months"].get(month_key(date_str), 0)
+
+
+if __name__ == "__main__":
+    from trakk.storage import open_storage  # Pluggable session storage
+
+    if len(sys.argv) not in (2, 3) or sys.argv[1] not in ("verify", "rebuild"):
+        print("Usage: python -m trakk.rollup verify|rebuild [data_dir]")
+        sys.exit(1)
+    data_dir = sys.argv[2] if len(sys.argv) == 3 else "data"
+    config = read_json(os.path.join(data_dir, "config.json"), {})
+    storage = open_storage(config, os.path.join(data_dir, "time_data.json"))
+    index = RollupIndex(os.path.join(data_dir, "rollup.json"), read_json(os.path.join(data_dir, "rollup.json"), None))
+    data = storage.load()
+    if sys.argv[1] == "rebuild":
+        index.rebuild(data)
+        print("Rollup index rebuilt")
+    else:
+        mismatches = index.verify(data)
+        for section, key, actual, expected in mismatches:
+            print(f"{section} {key}: index has {actual}, sessions sum to {expected}")
+        print("Rollup index OK" if not mismatches else f"{len(mismatches)} mismatches, run rebuild")
+        storage.close()
+        sys.exit(1 if mismatches else 0)
+    storage.close()
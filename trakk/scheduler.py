@@ -0,0 +1,93 @@
+# Deadline-based tracker wake-up scheduling on the monotonic clock
+
+import time  # Time-related functions
+
+IDLE_INTERVAL = 1.0
+IDLE_MAX_INTERVAL = 10.0
+IDLE_MARGIN = 0.05
+
+
+class PollScheduler:
+    """Decides when the tracker loop wakes next and measures how well it keeps time.
+
+    Deadlines are absolute ``time.monotonic()`` values measured from the start
+    of a tick, so the cost of sampling does not push later ticks back and wall
+    clock jumps (NTP, DST) do not affect them.
+
+    * a tracked app is in front and the user is active: wake exactly when the
+      idle time would reach the threshold if no further input arrives
+    * a tracked app is in front but the user is idle: poll for returning input,
+      backing off from ``idle_interval`` to ``idle_max_interval``
+    * no tracked app in front: ``untracked_interval`` (None waits for a
+      foreground change; the tracker still bounds that wait so config edits
+      are picked up)
+    """
+
+    def __init__(self, idle_threshold, idle_interval=IDLE_INTERVAL, idle_max_interval=IDLE_MAX_INTERVAL,
+                 untracked_interval=None, clock=time.monotonic):
+        self.idle_threshold = idle_threshold
+        self.idle_interval = idle_interval
+        self.idle_max_interval = max(idle_max_interval, idle_interval)
+        self.untracked_interval = untracked_interval
+        self.clock = clock
+        self.backoff = idle_interval
+        self.deadline = None
+        self.last_lateness = None
+        self.started_at = clock()
+        self.ticks = 0
+        self.timer_ticks = 0
+        self.lateness_total = 0.0
+        self.lateness_max = 0.0
+
+    @classmethod
+    def from_config(cls, config, idle_threshold, clock=time.monotonic):
+        options = config.get("scheduler", {})
+        return cls(
+            idle_threshold,
+            options.get("idle_interval", IDLE_INTERVAL),
+            options.get("idle_max_interval", IDLE_MAX_INTERVAL),
+            options.get("untracked_interval"),
+            clock
+        )
+
+    def tick(self):
+        # Call at the start of every loop iteration; returns the tick time
+        now = self.clock()
+        self.ticks += 1
+        self.last_lateness = None
+        if self.deadline is not None and now >= self.deadline:
+            lateness = self.last_lateness = now - self.deadline
+            self.timer_ticks += 1
+            self.lateness_total += lateness
+            self.lateness_max = max(self.lateness_max, lateness)
+        return now
+
+    def next_delay(self, tracked, active, idle_duration):
+        if not tracked:
+            self.backoff = self.idle_interval
+            return self.untracked_interval
+        if active:
+            self.backoff = self.idle_interval
+            return max(self.idle_threshold - idle_duration, 0) + IDLE_MARGIN
+        delay = self.backoff
+        self.backoff = min(self.backoff * 2, self.idle_max_interval)
+        return delay
+
+    def schedule(self, tick_time, delay):
+        self.deadline = None if delay is None else tick_time + delay
+
+    def timeout(self):
+        if self.deadline is None:
+            return None
+        return max(self.deadline - self.clock(), 0)
+
+    def stats(self):
+        uptime = self.clock() - self.started_at
+        return {
+            "ticks": self.ticks,
+            "uptime": round(uptime, 3),
+            "tick_rate": round(self.ticks / uptime, 4) if uptime > 0 else 0.0,
+            "timer_ticks": self.timer_ticks,
+            "mean_lateness": round(self.lateness_total / self.timer_ticks, 6) if self.timer_ticks else 0.0,
+            "max_lateness": round(self.lateness_max, 6)
+        }
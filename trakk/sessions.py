@@ -0,0 +1,102 @@
+# Compact columnar session store with conversion to/from the JSON layout
+
+from array import array  # Typed compact arrays
+from datetime import datetime, timedelta  # Date and time manipulation
+
+END_OF_DAY = "24:00:00"
+
+
+def session_start_ts(date_str, session):
+    # Sessions are filed under the date they ended on, so a start time later
+    # than the end time means the session began the previous day.
+    start = datetime.strptime(f"{date_str} {session['start']}", "%Y-%m-%d %H:%M:%S")
+    if session['start'] > session['end']:
+        start -= timedelta(days=1)
+    return int(start.timestamp())
+
+
+def split_at_midnight(start, duration):
+    # Yields (start, duration) pieces that each stay within one local day
+    end = start + duration
+    while True:
+        day_start = datetime.fromtimestamp(start).replace(hour=0, minute=0, second=0, microsecond=0)
+        next_midnight = int((day_start + timedelta(days=1)).timestamp())
+        if end <= next_midnight:
+            yield start, end - start
+            return
+        yield start, next_midnight - start
+        start = next_midnight
+
+
+def session_entry(start, duration):
+    # Returns (date_str, session dict) in the time_data.json layout. A session
+    # ending exactly at midnight keeps its day and ends at "24:00:00".
+    start_dt = datetime.fromtimestamp(start)
+    end_dt = datetime.fromtimestamp(start + duration)
+    last_second = datetime.fromtimestamp(start + duration - 1) if duration > 0 else start_dt
+    date_str = last_second.strftime("%Y-%m-%d")
+    if end_dt.date() != last_second.date():
+        end_str = END_OF_DAY
+    else:
+        end_str = end_dt.strftime("%H:%M:%S")
+    return date_str, {
+        "start": start_dt.strftime("%H:%M:%S"),
+        "end": end_str,
+        "duration": duration
+    }
+
+
+class SessionStore:
+    """Sessions as parallel typed columns: start epoch, duration and app id.
+
+    App names are interned once in ``apps``; each session costs 16 bytes
+    instead of a dict of time strings.
+    """
+
+    __slots__ = ("starts", "durations", "app_ids", "apps", "_app_ids")
+
+    def __init__(self):
+        self.starts = array('q')
+        self.durations = array('I')
+        self.app_ids = array('I')
+        self.apps = []
+        self._app_ids = {}
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        apps = self.apps
+        for start, duration, app_id in zip(self.starts, self.durations, self.app_ids):
+            yield start, duration, apps[app_id]
+
+    def intern(self, app_name):
+        app_id = self._app_ids.get(app_name)
+        if app_id is None:
+            app_id = self._app_ids[app_name] = len(self.apps)
+            self.apps.append(app_name)
+        return app_id
+
+    def add(self, app_name, start, duration):
+        self.starts.append(int(start))
+        self.durations.append(int(duration))
+        self.app_ids.append(self.intern(app_name))
+
+    @classmethod
+    def from_dict(cls, data):
+        store = cls()
+        for date_str, apps in data.items():
+            for app_name, sessions in apps.items():
+                app_id = store.intern(app_name)
+                for session in sessions:
+                    store.starts.append(session_start_ts(date_str, session))
+                    store.durations.append(session['duration'])
+                    store.app_ids.append(app_id)
+        return store
+
+    def to_dict(self):
+        data = {}
+        for start, duration, app_name in self:
+            date_str, session = session_entry(start, duration)
+            data.setdefault(date_str, {}).setdefault(app_name, []).append(session)
+        return data
@@ -0,0 +1,227 @@
+# Pluggable session storage: JSON journal (default) or SQLite
+
+import os  # Operating system functions
+import sys  # System-specific parameters and functions
+import sqlite3  # SQLite database
+import threading  # Threading support
+from datetime import datetime  # Date and time manipulation
+from trakk.journal import SessionJournal  # Append-only session storage
+from trakk.sessions import session_start_ts  # Session start epochs
+
+
+def month_of(date_str):
+    return date_str[:7]
+
+
+def file_version(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return "-"
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def filter_range(data, start_date, end_date=None, app=None):
+    end_date = end_date or start_date
+    result = {}
+    for date_str, apps in data.items():
+        if not start_date <= date_str <= end_date:
+            continue
+        if app is not None:
+            apps = {app: apps[app]} if app in apps else {}
+        if apps:
+            result[date_str] = apps
+    return result
+
+
+class JournalStorage:
+    def __init__(self, data_file):
+        self.journal = SessionJournal(data_file)
+
+    def load(self):
+        return self.journal.load()
+
+    def load_range(self, start_date, end_date=None, app=None):
+        return filter_range(self.load(), start_date, end_date, app)
+
+    def load_since(self, start_ts):
+        # Sessions are filed under their end date, so earlier days cannot
+        # hold a session starting at or after start_ts
+        first_date = datetime.fromtimestamp(start_ts).strftime("%Y-%m-%d")
+        result = {}
+        for date_str, apps in self.load().items():
+            if date_str < first_date:
+                continue
+            for app_name, sessions in apps.items():
+                kept = [session for session in sessions if session_start_ts(date_str, session) >= start_ts]
+                if kept:
+                    result.setdefault(date_str, {})[app_name] = kept
+        return result
+
+    def load_months(self, months):
+        # The snapshot cannot be read in parts, so it is parsed once and split
+        wanted = set(months)
+        partitions = {month: {} for month in months}
+        for date_str, apps in self.load().items():
+            if month_of(date_str) in wanted:
+                partitions[month_of(date_str)][date_str] = apps
+        return partitions.items()
+
+    def month_versions(self, months):
+        # Any change to either file, including hand edits, changes every month
+        self.journal.flush()
+        version = f"{file_version(self.journal.snapshot_path)}/{file_version(self.journal.journal_path)}"
+        return {month: version for month in months}
+
+    def append(self, date_str, app_name, session):
+        self.journal.append(date_str, app_name, session)
+
+    def replace(self, data):
+        self.journal.replace(data)
+
+    def close(self):
+        self.journal.close()
+
+
+class SQLiteStorage:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            app TEXT NOT NULL,
+            start TEXT NOT NULL,
+            end TEXT NOT NULL,
+            duration INTEGER NOT NULL,
+            start_ts INTEGER NOT NULL
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_sessions_date_app ON sessions (date, app, start, end);
+        CREATE INDEX IF NOT EXISTS idx_sessions_start_ts ON sessions (start_ts);
+        CREATE TABLE IF NOT EXISTS month_versions (
+            month TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        );
+        CREATE TRIGGER IF NOT EXISTS sessions_insert_version AFTER INSERT ON sessions BEGIN
+            INSERT INTO month_versions VALUES (substr(NEW.date, 1, 7), 1)
+                ON CONFLICT (month) DO UPDATE SET version = version + 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS sessions_update_version AFTER UPDATE ON sessions BEGIN
+            INSERT INTO month_versions VALUES (substr(OLD.date, 1, 7), 1)
+                ON CONFLICT (month) DO UPDATE SET version = version + 1;
+            INSERT INTO month_versions VALUES (substr(NEW.date, 1, 7), 1)
+                ON CONFLICT (month) DO UPDATE SET version = version + 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS sessions_delete_version AFTER DELETE ON sessions BEGIN
+            INSERT INTO month_versions VALUES (substr(OLD.date, 1, 7), 1)
+                ON CONFLICT (month) DO UPDATE SET version = version + 1;
+        END;
+        INSERT OR IGNORE INTO month_versions SELECT DISTINCT substr(date, 1, 7), 0 FROM sessions;
+    """
+    INSERT = (
+        "INSERT OR IGNORE INTO sessions (date, app, start, end, duration, start_ts) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    )
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def is_empty(self):
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM sessions LIMIT 1").fetchone() is None
+
+    def _to_dict(self, rows):
+        data = {}
+        for date_str, app_name, start, end, duration in rows:
+            data.setdefault(date_str, {}).setdefault(app_name, []).append({
+                "start": start,
+                "end": end,
+                "duration": duration
+            })
+        return data
+
+    def _query(self, where="", params=()):
+        sql = "SELECT date, app, start, end, duration FROM sessions"
+        if where:
+            sql += " WHERE " + where
+        sql += " ORDER BY date, id"
+        with self._lock:
+            return self._to_dict(self.conn.execute(sql, params))
+
+    def load(self):
+        return self._query()
+
+    def load_range(self, start_date, end_date=None, app=None):
+        end_date = end_date or start_date
+        if app is None:
+            return self._query("date BETWEEN ? AND ?", (start_date, end_date))
+        return self._query("date BETWEEN ? AND ? AND app = ?", (start_date, end_date, app))
+
+    def load_since(self, start_ts):
+        return self._query("start_ts >= ?", (int(start_ts),))
+
+    def load_months(self, months):
+        for month in months:
+            yield month, self.load_range(f"{month}-01", f"{month}-31")
+
+    def month_versions(self, months):
+        # Kept by triggers, so edits made outside Time Trakk count as well
+        with self._lock:
+            versions = dict(self.conn.execute("SELECT month, version FROM month_versions"))
+        return {month: versions.get(month) for month in months}
+
+    def _rows(self, data):
+        for date_str, apps in data.items():
+            for app_name, sessions in apps.items():
+                for session in sessions:
+                    yield (date_str, app_name, session['start'], session['end'],
+                           session['duration'], session_start_ts(date_str, session))
+
+    def insert_many(self, data):
+        with self._lock, self.conn:
+            return self.conn.executemany(self.INSERT, self._rows(data)).rowcount
+
+    def append(self, date_str, app_name, session):
+        self.insert_many({date_str: {app_name: [session]}})
+
+    def replace(self, data):
+        # One transaction, so a failed insert rolls the delete back too
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM sessions")
+            self.conn.executemany(self.INSERT, self._rows(data))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def import_json(json_file, storage):
+    # Reads through the journal so sessions not yet compacted are included
+    return storage.insert_many(JournalStorage(json_file).load())
+
+
+def open_storage(config, data_file):
+    backend = config.get("storage", "json")
+    if backend == "sqlite":
+        storage = SQLiteStorage(os.path.splitext(data_file)[0] + ".db")
+        json_files = (data_file, os.path.splitext(data_file)[0] + ".journal")
+        if storage.is_empty() and any(os.path.exists(path) for path in json_files):
+            # One-time import of the JSON history; a short history may only
+            # exist as a journal without a snapshot yet
+            storage.insert_many(JournalStorage(data_file).load())
+        return storage
+    if backend != "json":
+        print(f"Unknown storage backend '{backend}', falling back to json")
+    return JournalStorage(data_file)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m trakk.storage <time_data.json> <time_data.db>")
+        sys.exit(1)
+    storage = SQLiteStorage(sys.argv[2])
+    print(f"Imported {import_json(sys.argv[1], storage)} sessions into {sys.argv[2]}")
+    storage.close()
@@ -0,0 +1,208 @@
+# Multi-workstation aggregation: ingest a share of per-machine data files
+
+import os  # Operating system functions
+import json  # JSON handling
+import hashlib  # Content hashing
+from array import array  # Typed compact arrays
+from html import escape  # HTML escaping
+from concurrent.futures import ProcessPoolExecutor  # Parallel ingestion
+import numpy as np  # Vectorised arrays
+from trakk.journal import SessionJournal, read_json, write_json_atomic  # JSON history files
+from trakk.sessions import SessionStore  # Compact session columns
+from trakk.analytics import local_offsets  # Local time conversion
+from trakk.report import StreamingPage, format_hms  # HTML page writing
+
+DATA_FILE_NAMES = ("time_data.json",)
+NON_DATA_FILE_NAMES = (
+    "config.json", "rollup.json", "team_rollup.json", "manifest.json",
+    "background_data.json", "background_rollup.json"
+)
+APP_SHIFT = 40  # Epoch seconds fit well below 2**40
+
+
+def discover(root):
+    # Yields (user, path). A time_data.json in a sub-directory belongs to the
+    # user named by the first directory level (<root>/<user>/.../time_data.json);
+    # other JSON files at the top level are per-user exports named by stem.
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            relative = os.path.relpath(path, root).split(os.sep)
+            if len(relative) > 1:
+                if filename in DATA_FILE_NAMES:
+                    yield relative[0], path
+            elif filename.endswith(".json") and filename not in NON_DATA_FILE_NAMES:
+                yield os.path.splitext(filename)[0], path
+
+
+def fingerprint(path):
+    digest = hashlib.sha1()
+    for part in (path, os.path.splitext(path)[0] + ".journal"):
+        try:
+            with open(part, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        except FileNotFoundError:
+            pass
+    return digest.hexdigest()
+
+
+def file_stat(path):
+    stats = []
+    for part in (path, os.path.splitext(path)[0] + ".journal"):
+        try:
+            st = os.stat(part)
+            stats.append([st.st_mtime, st.st_size])
+        except FileNotFoundError:
+            stats.append(None)
+    return stats
+
+
+def parse_file(path):
+    # Runs in a worker process; returns plain columns that pickle cheaply
+    store = SessionStore.from_dict(SessionJournal(path).load())
+    return {
+        "apps": store.apps,
+        "starts": store.starts.tolist(),
+        "durations": store.durations.tolist(),
+        "app_ids": store.app_ids.tolist()
+    }
+
+
+def ingest_one(job):
+    path, known_hash = job
+    content_hash = fingerprint(path)
+    if content_hash == known_hash:
+        # Touched but unchanged, the cached columns are still valid
+        return path, content_hash, None
+    return path, content_hash, parse_file(path)
+
+
+class TeamIngest:
+    """Parses per-machine files in parallel, skipping unchanged ones.
+
+    A file is re-parsed only when its (and its journal's) mtime/size moved
+    and the content hash differs from the cached one.
+    """
+
+    def __init__(self, root, cache_dir, workers=None):
+        self.root = root
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.manifest_file = os.path.join(cache_dir, "manifest.json")
+
+    def cache_path(self, path):
+        return os.path.join(self.cache_dir, hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest() + ".json")
+
+    def run(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        manifest = read_json(self.manifest_file, {})
+        files = list(discover(self.root))
+        stale = []
+        for _, path in files:
+            entry = manifest.get(path)
+            if not os.path.exists(self.cache_path(path)):
+                stale.append((path, None))
+            elif not entry or entry["stat"] != file_stat(path):
+                stale.append((path, entry and entry.get("hash")))
+
+        parsed = []
+        if stale:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                for path, content_hash, columns in pool.map(ingest_one, stale, chunksize=4):
+                    if columns is not None:
+                        write_json_atomic(self.cache_path(path), columns)
+                        parsed.append(path)
+                    manifest[path] = {"stat": file_stat(path), "hash": content_hash}
+
+        seen = {path for _, path in files}
+        for path in set(manifest) - seen:
+            del manifest[path]
+            try:
+                os.remove(self.cache_path(path))
+            except FileNotFoundError:
+                pass
+        write_json_atomic(self.manifest_file, manifest)
+
+        users = {}
+        for user, path in files:
+            columns = read_json(self.cache_path(path), None)
+            if columns is None:
+                continue
+            store = users.setdefault(user, SessionStore())
+            app_map = array('I', [store.intern(app) for app in columns["apps"]])
+            store.starts.extend(columns["starts"])
+            store.durations.extend(columns["durations"])
+            store.app_ids.extend(app_map[app_id] for app_id in columns["app_ids"])
+        return users, parsed
+
+
+def deduplicate(store):
+    # Merges overlapping sessions of the same app, e.g. a data file that was
+    # copied twice or two machines logging the same work. Touching sessions
+    # (such as pieces split at midnight) are kept apart.
+    if not len(store):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    app_ids = np.asarray(store.app_ids, dtype=np.int64)
+    starts = np.asarray(store.starts, dtype=np.int64) + (app_ids << APP_SHIFT)
+    ends = starts + np.asarray(store.durations, dtype=np.int64)
+    order = np.argsort(starts, kind='stable')
+    starts, ends = starts[order], ends[order]
+    running_end = np.maximum.accumulate(ends)
+    breaks = np.concatenate(([True], starts[1:] >= running_end[:-1]))
+    merged_starts = starts[breaks]
+    merged_ends = np.maximum.reduceat(ends, np.flatnonzero(breaks))
+    merged_apps = merged_starts >> APP_SHIFT
+    return merged_starts - (merged_apps << APP_SHIFT), merged_ends - merged_starts, merged_apps
+
+
+def rollup_user(store):
+    starts, durations, app_ids = deduplicate(store)
+    days = (starts + local_offsets(starts)) // 86400 if len(starts) else starts
+    app_totals = np.bincount(app_ids, weights=durations, minlength=len(store.apps))
+    day_values, day_idx = np.unique(days, return_inverse=True)
+    day_totals = np.bincount(day_idx, weights=durations, minlength=len(day_values))
+    return {
+        "total": int(durations.sum()),
+        "sessions": int(len(starts)),
+        "duplicate_seconds": int(sum(store.durations) - durations.sum()),
+        "apps": {app: int(app_totals[app_id]) for app_id, app in enumerate(store.apps) if app_totals[app_id]},
+        "days": {str(np.datetime64(int(day), 'D')): int(total) for day, total in zip(day_values, day_totals)}
+    }
+
+
+def team_rollup(users):
+    result = {"users": {}, "apps": {}, "total": 0}
+    for user in sorted(users):
+        summary = rollup_user(users[user])
+        result["users"][user] = summary
+        result["total"] += summary["total"]
+        for app, total in summary["apps"].items():
+            result["apps"][app] = result["apps"].get(app, 0) + total
+    return result
+
+
+def write_team_report(result, path):
+    page = StreamingPage(path, "Team Activity Report")
+    page.write(f"<h1>Team Activity Report</h1><p>Total tracked: {format_hms(result['total'])}</p>")
+    page.write("<h2>Apps</h2><ul>")
+    for app, total in sorted(result["apps"].items(), key=lambda item: -item[1]):
+        page.write(f"<li>{escape(app)}: {format_hms(total)}</li>")
+    page.write("</ul><h2>People</h2>")
+    for user, summary in result["users"].items():
+        page.write(f"<h3>{escape(user)}</h3><p>Total time: {format_hms(summary['total'])}</p><ul>")
+        for app, total in sorted(summary["apps"].items(), key=lambda item: -item[1]):
+            page.write(f"<li>{escape(app)}: {format_hms(total)}</li>")
+        page.write("</ul>")
+    page.close()
+
+
+def build_team_report(root, out_dir, workers=None):
+    cache_dir = os.path.join(out_dir, "cache")
+    users, parsed = TeamIngest(root, cache_dir, workers).run()
+    result = team_rollup(users)
+    with open(os.path.join(out_dir, "team_rollup.json"), 'w') as f:
+        json.dump(result, f, indent=4)
+    write_team_report(result, os.path.join(out_dir, "team_report.html"))
+    return result, parsed